@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from manimlib.scene.scene import EndSceneEarlyException
+
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+BASELINE_DIR = os.path.join(REPO_DIR, ".benchmarks")
+
+# fixed slices of the scenes: one construct() phase each, cut off after a
+# fixed number of frames so the amount of work doesn't depend on run_times
+BENCHMARKS = [
+    {"name": "sine_introduce", "module": "sine", "scene": "Sine", "phase": "introduce", "frames": 150},
+    {"name": "sine_graph", "module": "sine", "scene": "Sine", "phase": "draw_graph", "frames": 300},
+    {"name": "cosine_introduce", "module": "cosine", "scene": "Cosine", "phase": "introduce", "frames": 150},
+    {"name": "cosine_graph", "module": "cosine", "scene": "Cosine", "phase": "draw_graph", "frames": 300},
+    {"name": "tangent_introduce", "module": "tangent", "scene": "Tangent", "phase": "introduce", "frames": 150},
+    {"name": "tangent_graph", "module": "tangent", "scene": "Tangent", "phase": "draw_graph", "frames": 300},
+]
+
+# every metric reported, with whether higher is better and how it's printed
+METRICS = {
+    "fps": (True, "{:.1f}"),
+    "peak_rss_mb": (False, "{:.0f}"),
+    "alloc_kb_per_frame": (False, "{:.0f}"),
+}
+
+
+class BenchmarkMixin(object):
+    # Fast forwards through the phases before benchmark_phase (as with -n,
+    # every play() jumps straight to its end), then renders benchmark_frames
+    # frames of that phase. Frames are dropped instead of being encoded.
+    CONFIG = {
+        "benchmark_phase": None,
+        "benchmark_frames": None,
+        "track_allocations": False,
+        "skip_animations": True,
+    }
+
+    def setup(self):
+        super().setup()
+        self.benchmark_frame_count = 0
+        self.benchmark_start = None
+        self.benchmark_end = None
+        self.frame_allocations = []
+
+        phase = getattr(self, self.benchmark_phase)
+
+        def run_phase(*args, **kwargs):
+            self.skip_animations = False
+            if self.track_allocations:
+                tracemalloc.start()
+                self.frame_start_memory = 0
+            self.benchmark_start = time.perf_counter()
+            phase(*args, **kwargs)
+            # the phase ended before the frame budget ran out
+            self.stop_benchmark()
+
+        setattr(self, self.benchmark_phase, run_phase)
+
+    def stop_benchmark(self):
+        self.benchmark_end = time.perf_counter()
+        if self.track_allocations:
+            tracemalloc.stop()
+        raise EndSceneEarlyException()
+
+    def add_frames(self, *frames):
+        super().add_frames(*frames)
+        if self.skip_animations:
+            return
+        if self.track_allocations:
+            # the most memory a frame held on top of what was already live
+            # when it started, i.e. what it allocated and threw away again
+            current, peak = tracemalloc.get_traced_memory()
+            self.frame_allocations.append(peak - self.frame_start_memory)
+            tracemalloc.reset_peak()
+            self.frame_start_memory = current
+        self.benchmark_frame_count += len(frames)
+        if self.benchmark_frame_count >= self.benchmark_frames:
+            self.stop_benchmark()
+
+
+def make_benchmark_scene_class(scene_class):
+    return type(scene_class.__name__, (BenchmarkMixin, scene_class), {})
+
+
+def run_benchmark(benchmark, quality, media_dir, track_allocations = False):
+    init_media_dirs(media_dir)
+    _, scene_class = load_scene_class(benchmark["module"], benchmark["scene"])
+    scene = make_benchmark_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {"write_to_movie": False},
+        benchmark_phase = benchmark["phase"],
+        benchmark_frames = benchmark["frames"],
+        track_allocations = track_allocations,
+    )
+    elapsed = scene.benchmark_end - scene.benchmark_start
+    # the first frame also carries the setup of the phase
+    allocations = scene.frame_allocations[1:]
+    return {
+        "frames": scene.benchmark_frame_count,
+        "seconds": elapsed,
+        "fps": scene.benchmark_frame_count / elapsed,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "alloc_kb_per_frame": sum(allocations) / max(len(allocations), 1) / 1024,
+    }
+
+
+def run_in_new_process(*args, **kwargs):
+    # a fresh process for every run, so peak RSS belongs to that run alone
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers = 1, mp_context = context) as executor:
+        return executor.submit(run_benchmark, *args, **kwargs).result()
+
+
+def measure(benchmark, quality, media_dir, repeat):
+    # tracemalloc slows everything down, so allocations are counted in a
+    # separate run from the one that is timed
+    runs = [run_in_new_process(benchmark, quality, media_dir) for _ in range(repeat)]
+    result = max(runs, key = lambda r: r["fps"])
+    result["peak_rss_mb"] = min(r["peak_rss_mb"] for r in runs)
+    tracked = run_in_new_process(benchmark, quality, media_dir, track_allocations = True)
+    result["alloc_kb_per_frame"] = tracked["alloc_kb_per_frame"]
+    return result
+
+
+def get_baseline_path(quality):
+    return os.path.join(BASELINE_DIR, "{}.json".format(quality))
+
+
+def load_baseline(quality):
+    try:
+        with open(get_baseline_path(quality)) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(quality, results):
+    baseline = load_baseline(quality)
+    baseline.update(results)
+    os.makedirs(BASELINE_DIR, exist_ok = True)
+    with open(get_baseline_path(quality), "w") as fp:
+        json.dump(baseline, fp, indent = 1, sort_keys = True)
+
+
+def find_regressions(result, baseline, tolerance):
+    regressions = []
+    for metric, (higher_is_better, _) in METRICS.items():
+        if metric not in baseline:
+            continue
+        change = (result[metric] - baseline[metric]) / max(baseline[metric], 1e-9)
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append((metric, change))
+    return regressions
+
+
+def format_result(metric, result, baseline):
+    text = METRICS[metric][1].format(result[metric])
+    if metric in baseline:
+        change = (result[metric] - baseline[metric]) / max(baseline[metric], 1e-9)
+        text += " ({:+.0f}%)".format(100 * change)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmark fixed slices of the trig scenes")
+    parser.add_argument(
+        "benchmarks",
+        nargs = "*",
+        help = "names of the benchmarks to run (all by default): {}".format(
+            ", ".join(b["name"] for b in BENCHMARKS)
+        ),
+    )
+    parser.add_argument(
+        "-q", "--quality",
+        default = "low",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "-n", "--repeat",
+        type = int,
+        default = 3,
+        help = "timed runs per benchmark, the best one counts",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type = float,
+        default = 0.1,
+        help = "relative change against the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--save",
+        action = "store_true",
+        help = "store the results as the new baseline",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    names = [b["name"] for b in BENCHMARKS]
+    unknown = set(args.benchmarks) - set(names)
+    if unknown:
+        parser.error("unknown benchmark(s): {}".format(", ".join(sorted(unknown))))
+    benchmarks = [b for b in BENCHMARKS if not args.benchmarks or b["name"] in args.benchmarks]
+
+    baselines = load_baseline(args.quality)
+    results = {}
+    flagged = []
+    print("{:<20}{:>8}{:>18}{:>18}{:>20}".format("benchmark", "frames", "fps", "peak RSS (MB)", "alloc/frame (KB)"))
+    for benchmark in benchmarks:
+        result = measure(benchmark, args.quality, args.media_dir, max(1, args.repeat))
+        baseline = baselines.get(benchmark["name"], {})
+        results[benchmark["name"]] = result
+        print("{:<20}{:>8}{:>18}{:>18}{:>20}".format(
+            benchmark["name"],
+            result["frames"],
+            *[format_result(metric, result, baseline) for metric in METRICS]
+        ))
+        flagged += [(benchmark["name"], metric, change) for metric, change in find_regressions(result, baseline, args.tolerance)]
+
+    if args.save:
+        save_baseline(args.quality, results)
+        print("baseline saved to {}".format(get_baseline_path(args.quality)))
+
+    if flagged:
+        print("\nregressions against the baseline:", file = sys.stderr)
+        for name, metric, change in flagged:
+            print("  {} {}: {:+.0f}%".format(name, metric, 100 * change), file = sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
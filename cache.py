@@ -0,0 +1,297 @@
+import collections
+import hashlib
+import os
+import pickle
+import shutil
+
+import manimlib
+from manimlib.constants import TEMPLATE_TEX_FILE_BODY
+from manimlib.mobject.svg.tex_mobject import TexMobject
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def config_hash(*items):
+    # repr() of the nested config dicts is stable as long as the dicts
+    # keep their insertion order, which CONFIG merging preserves
+    hasher = hashlib.sha256()
+    hasher.update(repr((getattr(manimlib, "__version__", ""),) + items).encode())
+    return hasher.hexdigest()[:16]
+
+
+def get_function_key(function):
+    # What a function computes, as far as its code tells: for keys of
+    # cached results of the function, where its name or a label isn't
+    # enough. Covers the code (and that of functions defined in it), the
+    # defaults and the values it closes over, but not the globals it reads.
+    code = getattr(function, "__code__", None)
+    if code is None:
+        # builtins and numpy ufuncs like np.tan
+        return (
+            getattr(function, "__module__", None) or type(function).__module__,
+            getattr(function, "__qualname__", None) or getattr(function, "__name__", repr(function)),
+        )
+    return (
+        function.__module__,
+        function.__qualname__,
+        get_code_key(code),
+        get_value_key(function.__defaults__),
+        get_value_key([cell.cell_contents for cell in function.__closure__ or []]),
+    )
+
+
+def get_code_key(code):
+    return (
+        hashlib.sha256(code.co_code).hexdigest()[:16],
+        code.co_names,
+        tuple(get_value_key(const) for const in code.co_consts),
+    )
+
+
+def get_builder_key(build):
+    # only the code of the builder, not the values it closes over: those
+    # are mostly the scene, and the config passed along with the builder
+    # covers what of the scene goes into the mobject
+    code = getattr(build, "__code__", None)
+    return get_code_key(code) if code is not None else get_function_key(build)
+
+
+def get_value_key(value):
+    if callable(value) and not isinstance(value, type):
+        return get_function_key(value)
+    if hasattr(value, "co_code"):
+        return get_code_key(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(get_value_key(item) for item in value)
+    text = repr(value)
+    # reprs with an address change from run to run
+    return type(value).__name__ if " at 0x" in text else text
+
+
+def load_pickle(path):
+    try:
+        with open(path, "rb") as fp:
+            return pickle.load(fp)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def dump_pickle(obj, path):
+    # write to a temporary file first, so that other processes
+    # reading the cache never see a half written entry
+    temp_path = path + ".tmp{}".format(os.getpid())
+    try:
+        with open(temp_path, "wb") as fp:
+            pickle.dump(obj, fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except (OSError, pickle.PicklingError, AttributeError, TypeError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class DiskCache(object):
+    # Content addressed cache shared by every process on the machine, with
+    # an in-process layer in front of it. Entries are evicted least recently
+    # used first (by mtime, which is touched on every hit) once the
+    # directory grows past max_size bytes. The in-process layer evicts
+    # least recently used first as well, once the entries it holds add up
+    # to more than max_memory_size bytes on disk.
+    def __init__(self, name, max_size, max_memory_size = None):
+        self.directory = os.path.join(CACHE_DIR, name)
+        self.max_size = max_size
+        self.max_memory_size = max_size if max_memory_size is None else max_memory_size
+        self.memory = collections.OrderedDict()
+        self.memory_sizes = {}
+        self.memory_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        if key in self.memory:
+            self.hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        path = self.get_path(key)
+        value = load_pickle(path)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.remember(key, value, get_file_size(path))
+        return value
+
+    def put(self, key, value):
+        os.makedirs(self.directory, exist_ok = True)
+        path = self.get_path(key)
+        dump_pickle(value, path)
+        self.remember(key, value, get_file_size(path))
+        self.evict()
+
+    def remember(self, key, value, size):
+        self.forget(key)
+        self.memory[key] = value
+        self.memory_sizes[key] = size
+        self.memory_size += size
+        while self.memory_size > self.max_memory_size and len(self.memory) > 1:
+            self.forget(next(iter(self.memory)))
+
+    def forget(self, key):
+        if key in self.memory:
+            del self.memory[key]
+            self.memory_size -= self.memory_sizes.pop(key)
+
+    def clear_memory(self):
+        self.memory.clear()
+        self.memory_sizes.clear()
+        self.memory_size = 0
+
+    def get_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if self.is_entry(entry.name):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.get_entries())
+        total = sum(size for _, size, _ in entries)
+        while entries and total > self.max_size:
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def is_entry(self, file_name):
+        return file_name.endswith(".pkl")
+
+    def preload(self, max_size = None):
+        # load the most recently used entries into memory ahead of time,
+        # for long lived processes (see render_daemon.py)
+        if not os.path.isdir(self.directory):
+            return 0
+        max_size = min(self.max_memory_size, self.max_size if max_size is None else max_size)
+        entries = []
+        total = 0
+        for _, size, path in sorted(self.get_entries(), reverse = True):
+            if total + size > max_size:
+                break
+            entries.append((size, path))
+            total += size
+        loaded = 0
+        # least recently used first, so they are also the first to go again
+        for size, path in reversed(entries):
+            key = os.path.splitext(os.path.basename(path))[0]
+            if key in self.memory:
+                continue
+            value = load_pickle(path)
+            if value is not None:
+                self.remember(key, value, size)
+                loaded += 1
+        return loaded
+
+    def get_stats(self):
+        entries = self.get_entries() if os.path.isdir(self.directory) else []
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "memory_entries": len(self.memory),
+            "memory_size": self.memory_size,
+        }
+
+
+class FileCache(DiskCache):
+    # A DiskCache whose entries are files of their own, like movies, which
+    # are looked up by path instead of being loaded into memory. Keys
+    # include the file extension.
+    def get_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        path = self.get_path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, file_path):
+        os.makedirs(self.directory, exist_ok = True)
+        path = self.get_path(key)
+        temp_path = path + ".tmp{}".format(os.getpid())
+        try:
+            shutil.copyfile(file_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def is_entry(self, file_name):
+        return ".tmp" not in file_name
+
+
+mobject_cache = DiskCache("mobjects", max_size = 256 * 1024 * 1024, max_memory_size = 64 * 1024 * 1024)
+tex_cache = DiskCache("tex", max_size = 64 * 1024 * 1024, max_memory_size = 32 * 1024 * 1024)
+graph_cache = DiskCache("graphs", max_size = 64 * 1024 * 1024, max_memory_size = 32 * 1024 * 1024)
+movie_cache = FileCache("movies", max_size = 4 * 1024 * 1024 * 1024)
+
+
+# bump to drop every cached mobject, when what a builder makes changes
+# without its code changing (e.g. a change to GlyphNumberPlane itself)
+# 2: labels and numbers put together from glyphs (see glyphs.py)
+MOBJECT_CACHE_VERSION = 2
+
+
+def cached_mobject(name, config, build, cache = mobject_cache):
+    # config is what the mobject is built from, and the code of build
+    # what it is built with: a builder making another class gets other keys
+    key = "{}_{}".format(name, config_hash(config, get_builder_key(build), MOBJECT_CACHE_VERSION))
+    mobject = cache.get(key)
+    if mobject is None:
+        mobject = build()
+        cache.put(key, mobject)
+    return mobject.copy()
+
+
+def get_tex_config_key(tex_strings, tex_config):
+    # colors for substrings that don't occur don't change the result, so
+    # "\\theta" is shared between scenes with different tex_to_color_maps
+    color_map = tex_config.get("tex_to_color_map", {})
+    used_colors = sorted(
+        (tex, str(color)) for tex, color in color_map.items()
+        if tex in "".join(tex_strings)
+    )
+    return dict(tex_config, tex_to_color_map = used_colors)
+
+
+def cached_tex(*tex_strings, **kwargs):
+    # a drop in replacement for TexMobject which skips both LaTeX and the
+    # svg parsing whenever the same strings were typeset before
+    template = kwargs.get("template_tex_file_body", TEMPLATE_TEX_FILE_BODY)
+    return cached_mobject(
+        "tex",
+        (tex_strings, get_tex_config_key(tex_strings, kwargs), template),
+        lambda: TexMobject(*tex_strings, **kwargs),
+        cache = tex_cache,
+    )
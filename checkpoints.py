@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+import argparse
+import importlib
+import io
+import marshal
+import os
+import pickle
+import random
+import sys
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import manimlib.constants as consts
+
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+# CONFIG that changes how a scene is rendered, but not what's in it
+RENDER_CONFIG = [
+    "camera_config",
+    "file_writer_config",
+    "skip_animations",
+    "start_at_animation_number",
+    "end_at_animation_number",
+    "leave_progress_bars",
+]
+
+# caches the scenes keep between plays, rebuilt whenever they are missing
+TRANSIENT_ATTRIBUTES = [
+    "frame_layers",
+    "layer_scratch",
+    "dirty_state",
+]
+
+
+# pickling functions by value
+
+def make_function(code, module_name, name, qualname, n_cells):
+    closure = tuple(types.CellType() for _ in range(n_cells))
+    function = types.FunctionType(
+        marshal.loads(code),
+        importlib.import_module(module_name).__dict__,
+        name,
+        None,
+        closure or None,
+    )
+    function.__qualname__ = qualname
+    return function
+
+
+def set_function_state(function, state):
+    defaults, kwdefaults, cell_values, attributes = state
+    function.__defaults__ = defaults
+    function.__kwdefaults__ = kwdefaults
+    for cell, value in zip(function.__closure__ or (), cell_values):
+        # (value,), or () for a variable that wasn't assigned yet
+        if value:
+            cell.cell_contents = value[0]
+    function.__dict__.update(attributes)
+
+
+def get_cell_value(cell):
+    try:
+        return (cell.cell_contents,)
+    except ValueError:
+        return ()
+
+
+class ScenePickler(pickle.Pickler):
+    # Pickles the scene's mobjects together with their updaters, which are
+    # mostly lambdas closing over the scene. Functions that can't be found
+    # by name are pickled by value: their code (for this Python version
+    # only), module and closure. The closure's values are restored after
+    # the function exists, so cycles like scene -> mobject -> updater ->
+    # scene work out.
+    #
+    # The scene itself and anything in external (like its camera) are
+    # pickled by name only, and replaced by their counterparts when loading.
+    def __init__(self, file, external):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self.external = dict((id(obj), name) for name, obj in external.items())
+
+    def persistent_id(self, obj):
+        return self.external.get(id(obj))
+
+    def reducer_override(self, obj):
+        if type(obj) is not types.FunctionType or "<" not in obj.__qualname__:
+            return NotImplemented
+        state = (
+            obj.__defaults__,
+            obj.__kwdefaults__,
+            tuple(get_cell_value(cell) for cell in obj.__closure__ or ()),
+            obj.__dict__,
+        )
+        args = (
+            marshal.dumps(obj.__code__),
+            obj.__globals__["__name__"],
+            obj.__name__,
+            obj.__qualname__,
+            len(obj.__closure__ or ()),
+        )
+        return make_function, args, state, None, None, set_function_state
+
+
+class SceneUnpickler(pickle.Unpickler):
+    def __init__(self, file, external):
+        pickle.Unpickler.__init__(self, file)
+        self.external = external
+
+    def persistent_load(self, name):
+        return self.external[name]
+
+
+# the checkpoints
+
+class CheckpointMixin(object):
+    # Saves the scene at the start of every phase (see
+    # TrigFunctionScene.phases) after the first: its mobjects with their
+    # updaters, the trackers and everything else the phases set on it, like
+    # self.theta, self.circle or self.graph_plane, and the random state.
+    # A scene built with start_phase loads the checkpoint of that phase
+    # instead of running the ones before it, and stops after end_phase.
+    #
+    # CONFIG isn't part of a checkpoint; it comes from the class as usual,
+    # and a checkpoint saved with a different CONFIG is refused. Neither is
+    # the code: after changing a phase, the checkpoints after it are stale
+    # until they are saved again.
+    CONFIG = {
+        "checkpoint_dir": None,
+        "save_checkpoints": True,
+        "start_phase": None,
+        "end_phase": None,
+    }
+
+    def construct(self):
+        phases = self.phases
+        start = phases.index(self.start_phase) if self.start_phase else 0
+        end = phases.index(self.end_phase) + 1 if self.end_phase else len(phases)
+        if start > 0:
+            self.load_checkpoint(start)
+        for index in range(start, end):
+            if index > start and self.save_checkpoints:
+                self.save_checkpoint(index)
+            getattr(self, phases[index])()
+
+    def get_checkpoint_path(self, index):
+        return os.path.join(self.checkpoint_dir, "{:02}_{}.pkl".format(index, self.phases[index]))
+
+    def get_external_objects(self):
+        return {
+            "scene": self,
+            "camera": self.camera,
+            "file_writer": self.file_writer,
+        }
+
+    def get_config_keys(self):
+        keys = set()
+        for cls in type(self).__mro__:
+            keys.update(getattr(cls, "CONFIG", {}))
+        return keys
+
+    def get_config_version(self):
+        # the CONFIG values that can be told apart by repr, with the
+        # Python version, since functions are saved as bytecode
+        config_keys = self.get_config_keys() - set(CheckpointMixin.CONFIG) - set(RENDER_CONFIG)
+        return repr((sys.version, sorted(
+            (key, repr(getattr(self, key))) for key in config_keys
+            if hasattr(self, key) and " at 0x" not in repr(getattr(self, key))
+        )))
+
+    def get_checkpoint_state(self):
+        skipped = self.get_config_keys() | set(self.get_external_objects()) | set(TRANSIENT_ATTRIBUTES)
+        return {
+            "attributes": dict(
+                (key, value) for key, value in vars(self).items()
+                if key not in skipped
+            ),
+            "random_state": (random.getstate(), np.random.get_state()),
+        }
+
+    def save_checkpoint(self, index):
+        os.makedirs(self.checkpoint_dir, exist_ok = True)
+        output = io.BytesIO()
+        pickle.dump(self.get_config_version(), output)
+        ScenePickler(output, self.get_external_objects()).dump(self.get_checkpoint_state())
+        path = self.get_checkpoint_path(index)
+        # write to a temporary file first, so that no worker loads half of it
+        temp_path = path + ".tmp{}".format(os.getpid())
+        with open(temp_path, "wb") as fp:
+            fp.write(output.getvalue())
+        os.replace(temp_path, path)
+
+    def load_checkpoint(self, index):
+        path = self.get_checkpoint_path(index)
+        if not os.path.exists(path):
+            raise Exception("No checkpoint for {} at {}, render the phases before it first".format(
+                self.phases[index], path,
+            ))
+        with open(path, "rb") as fp:
+            if pickle.load(fp) != self.get_config_version():
+                raise Exception("The checkpoint at {} was saved with a different CONFIG".format(path))
+            state = SceneUnpickler(fp, self.get_external_objects()).load()
+        self.__dict__.update(state["attributes"])
+        python_state, numpy_state = state["random_state"]
+        random.setstate(python_state)
+        np.random.set_state(numpy_state)
+
+
+def make_checkpoint_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (CheckpointMixin, scene_class), {})
+
+
+def get_checkpoint_directory(module_name, scene_name):
+    # the state of a scene doesn't depend on the quality it's rendered at
+    return os.path.join(consts.VIDEO_DIR, module_name, "checkpoints", scene_name)
+
+
+def render_phases(module_name, scene_name, quality, media_dir, start_phase = None, end_phase = None):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    file_writer_config = {
+        "write_to_movie": True,
+        "input_file_path": module.__file__,
+    }
+    if start_phase is not None:
+        # e.g. Tangent_draw_graph.mp4, next to Tangent.mp4
+        file_writer_config["file_name"] = "_".join([scene_name, start_phase] + (
+            [end_phase] if end_phase not in (None, start_phase) else []
+        ))
+    start = time.time()
+    make_checkpoint_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = file_writer_config,
+        checkpoint_dir = get_checkpoint_directory(module_name, scene_name),
+        start_phase = start_phase,
+        end_phase = end_phase,
+    )
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render a scene, or some of its phases from their checkpoints")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "production",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "-p", "--phase",
+        action = "append",
+        help = "render only this phase, starting from its checkpoint (can be repeated, "
+               "phases are then rendered side by side)",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    job = (args.module, args.scene, args.quality, args.media_dir)
+    if not args.phase:
+        elapsed = render_phases(*job)
+        print("Rendered {} and saved its checkpoints in {:.1f}s".format(args.scene, elapsed))
+        return
+
+    with ProcessPoolExecutor(max_workers = len(args.phase)) as executor:
+        futures = dict(
+            (phase, executor.submit(render_phases, *job, start_phase = phase, end_phase = phase))
+            for phase in args.phase
+        )
+        for phase, future in futures.items():
+            print("{} done in {:.1f}s".format(phase, future.result()))
+
+
+if __name__ == "__main__":
+    main()
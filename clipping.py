@@ -0,0 +1,110 @@
+import numpy as np
+
+# Geometry that can leave the frame by any distance, like the point where
+# the ray meets the tangent line, which is at infinity whenever the ray is
+# parallel to it. Cairo has to clip whatever the camera hands it, and paths
+# thousands of units long make single frames many times slower than the
+# rest. These functions bring such geometry back to the frame, plus a
+# margin, before it is drawn: what lies outside the frame isn't visible
+# anyway, so clipped lines look the same.
+#
+# Bounds are (lower, upper) corners of a box. Only x and y are clipped.
+
+# what infinite coordinates become, far enough out to clip like them
+FAR = 1e12
+
+
+def get_frame_bounds(camera, margin):
+    # margin has to be wider than any dot or stroke, so that what is moved
+    # onto the edge of the bounds is still out of sight
+    half = np.array([camera.get_frame_width() / 2 + margin, camera.get_frame_height() / 2 + margin, np.inf])
+    center = np.array(camera.get_frame_center(), dtype = float)
+    return center - half, center + half
+
+
+def is_inside(point, bounds):
+    lower, upper = bounds
+    return bool(np.all(lower[:2] <= point[:2]) and np.all(point[:2] <= upper[:2]))
+
+
+def finite(point):
+    return np.nan_to_num(point, posinf = FAR, neginf = -FAR)
+
+
+def clip_point(point, bounds):
+    # a point outside the bounds moves onto their edge
+    lower, upper = bounds
+    return np.clip(finite(point), lower, upper)
+
+
+def clip_segment(start, end, bounds):
+    # Liang-Barsky: the part of the segment from start to end inside the
+    # bounds, or both ends on the edge when none of it is
+    lower, upper = bounds
+    start, end = finite(start), finite(end)
+    delta = end - start
+    t0, t1 = 0.0, 1.0
+    for axis in range(2):
+        for p, q in ((-delta[axis], start[axis] - lower[axis]), (delta[axis], upper[axis] - start[axis])):
+            if p == 0:
+                if q < 0:
+                    t0, t1 = 1.0, 0.0
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+    if t0 > t1:
+        point = clip_point(start, bounds)
+        return point, point
+    return start + t0 * delta, start + t1 * delta
+
+
+def cap_segment(start, end, max_length):
+    # Shortens the segment to max_length, keeping its start and direction.
+    # For things that are stretched along the segment, like braces, whose
+    # visible part depends on the full length: capped at a length that
+    # takes their middle out of the frame, they leave it as they would
+    # have, without growing any further.
+    start, end = finite(start), finite(end)
+    length = np.linalg.norm(end - start)
+    if length <= max_length:
+        return start, end
+    return start, start + (end - start) * (max_length / length)
+
+
+def get_visible_intervals(function, t_min, t_max, t_step, bounds, iterations = 50):
+    # The intervals of [t_min, t_max] in which function (t -> point) stays
+    # inside the bounds, checked every t_step / 4. Their ends, where the
+    # function crosses the edge of the bounds, are found by bisection.
+    def inside(t):
+        # nan and infinite points never are
+        return is_inside(function(t), bounds)
+
+    def find_crossing(t0, t1, inside0):
+        for _ in range(iterations):
+            t_mid = (t0 + t1) / 2
+            if inside(t_mid) == inside0:
+                t0 = t_mid
+            else:
+                t1 = t_mid
+        # the end of the interval that is inside
+        return t0 if inside0 else t1
+
+    ts = np.linspace(t_min, t_max, int(np.ceil(4 * (t_max - t_min) / t_step)) + 1)
+    flags = [inside(t) for t in ts]
+    intervals = []
+    start = t_min if flags[0] else None
+    for t0, t1, inside0, inside1 in zip(ts[:-1], ts[1:], flags[:-1], flags[1:]):
+        if inside0 == inside1:
+            continue
+        crossing = find_crossing(t0, t1, inside0)
+        if inside1:
+            start = crossing
+        else:
+            intervals.append((start, crossing))
+            start = None
+    if start is not None:
+        intervals.append((start, t_max))
+    return [(t0, t1) for t0, t1 in intervals if t1 > t0]
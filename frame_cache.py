@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+import argparse
+import hashlib
+import os
+import shutil
+import time
+
+import numpy as np
+
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.scene.scene import Scene
+from manimlib.utils.iterables import list_update
+
+from cache import config_hash, movie_cache
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+
+class FrameCacheMixin(object):
+    # Reuses the partial movie of every play() or wait() whose frames come
+    # out exactly as they did in an earlier render.
+    #
+    # A survey run (frame_cache_mode "survey") goes through the scene logic
+    # frame by frame without drawing or writing anything, and hashes what
+    # each frame shows: the points and style of every mobject drawn, in
+    # drawing order. The key of a play is the hash of its frames and the
+    # camera, not of the code that produced them, so editing the end of
+    # draw_graph leaves the keys of every play before it alone. The render
+    # run then draws and encodes only the plays whose key isn't in
+    # movie_cache, and copies the partial movies of the others from it.
+    #
+    # This relies on the scene being deterministic, which Scene makes sure
+    # of for anything random by seeding it with random_seed.
+    CONFIG = {
+        "frame_cache_mode": "render",
+        # from get_play_keys() of the survey run
+        "play_keys": None,
+    }
+
+    def setup(self):
+        super().setup()
+        self.play_frame_hashes = []
+        self.play_is_cached = False
+        self.writes_movie = self.file_writer.write_to_movie
+        self.rendered_play = None
+        self.reused_plays = 0
+
+    def tear_down(self):
+        # before anything finishes the file writer: the last play may have
+        # been reused, and with write_to_movie off the partial movies
+        # wouldn't be combined
+        self.store_rendered_play()
+        self.play_is_cached = False
+        self.file_writer.write_to_movie = self.writes_movie
+        super().tear_down()
+
+    def is_drawing(self):
+        return self.frame_cache_mode != "survey" and not self.play_is_cached
+
+    def get_play_key(self, index):
+        if self.play_keys is None or index >= len(self.play_keys):
+            return None
+        return self.play_keys[index]
+
+    def store_rendered_play(self):
+        # the partial movie is only complete once the next play begins
+        if self.rendered_play is not None:
+            key, path = self.rendered_play
+            if os.path.exists(path):
+                movie_cache.put(key, path)
+            self.rendered_play = None
+
+    def update_skipping_status(self):
+        self.store_rendered_play()
+        super().update_skipping_status()
+        if self.frame_cache_mode == "survey":
+            self.play_frame_hashes.append([])
+            return
+
+        file_writer = self.file_writer
+        key = self.get_play_key(self.num_plays)
+        path = None
+        if key is not None and self.writes_movie and not self.skip_animations:
+            path = movie_cache.get(key)
+        self.play_is_cached = path is not None
+        file_writer.write_to_movie = self.writes_movie and not self.play_is_cached
+        if self.play_is_cached:
+            shutil.copyfile(path, file_writer.get_next_partial_movie_path())
+            self.reused_plays += 1
+        elif key is not None and file_writer.write_to_movie:
+            self.rendered_play = (key, file_writer.get_next_partial_movie_path())
+
+    def progress_through_animations(self, animations):
+        if self.is_drawing():
+            return super().progress_through_animations(animations)
+        # nothing gets drawn, so skip preparations like rasterizing layers
+        return Scene.progress_through_animations(self, animations)
+
+    def update_frame(self, *args, **kwargs):
+        if self.is_drawing():
+            super().update_frame(*args, **kwargs)
+
+    def get_frame(self):
+        if self.is_drawing():
+            return super().get_frame()
+        return None
+
+    def add_frames(self, *frames):
+        if self.frame_cache_mode == "survey" and self.play_frame_hashes:
+            self.play_frame_hashes[-1].append((self.get_frame_hash(), len(frames)))
+        super().add_frames(*frames)
+
+    def get_frame_hash(self):
+        hasher = hashlib.sha256()
+        mobjects = self.camera.extract_mobject_family_members(
+            list_update(self.mobjects, self.foreground_mobjects),
+            only_those_with_points = True,
+        )
+        for mobject in mobjects:
+            for data in get_render_state(mobject):
+                hasher.update(data)
+        return hasher.hexdigest()
+
+    def get_play_keys(self):
+        camera = self.camera
+        frame_config = (
+            type(camera).__name__,
+            camera.get_pixel_width(),
+            camera.get_pixel_height(),
+            camera.frame_rate,
+            camera.get_frame_width(),
+            camera.get_frame_height(),
+            tuple(camera.get_frame_center()),
+            str(camera.background_color),
+            camera.background_opacity,
+            camera.cairo_line_width_multiple,
+        )
+        extension = self.file_writer.movie_file_extension
+        return [
+            config_hash(frame_config, frame_hashes) + extension
+            for frame_hashes in self.play_frame_hashes
+        ]
+
+
+def get_render_state(mobject):
+    # everything the camera reads from a mobject to draw it
+    state = [type(mobject).__name__.encode(), np.ascontiguousarray(mobject.points).tobytes()]
+    if isinstance(mobject, VMobject):
+        state += [
+            mobject.get_fill_rgbas().tobytes(),
+            mobject.get_stroke_rgbas().tobytes(),
+            mobject.get_stroke_rgbas(background = True).tobytes(),
+            np.array(mobject.get_stroke_width()).tobytes(),
+            np.array(mobject.get_stroke_width(background = True)).tobytes(),
+            np.array(mobject.get_sheen_direction()).tobytes(),
+            np.array(mobject.get_sheen_factor()).tobytes(),
+        ]
+    else:
+        for attr in ("rgbas", "pixel_array", "stroke_width"):
+            if hasattr(mobject, attr):
+                state.append(np.array(getattr(mobject, attr)).tobytes())
+    return state
+
+
+def make_frame_cache_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (FrameCacheMixin, scene_class), {})
+
+
+def render_with_frame_cache(module_name, scene_name, quality, media_dir):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    scene_class = make_frame_cache_scene_class(scene_class)
+    survey = scene_class(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        frame_cache_mode = "survey",
+    )
+    play_keys = survey.get_play_keys()
+    scene = scene_class(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": True,
+            "input_file_path": module.__file__,
+        },
+        play_keys = play_keys,
+    )
+    return scene.reused_plays, len(play_keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render one scene, reusing every play that didn't change")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "production",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    reused, n_plays = render_with_frame_cache(args.module, args.scene, args.quality, args.media_dir)
+    stats = movie_cache.get_stats()
+    print("{} of {} plays reused, in {:.1f}s (cache: {} movies, {:.0f}MB)".format(
+        reused, n_plays, time.time() - start, stats["entries"], stats["size"] / 1024 / 1024,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+
+from manimlib.scene.scene_file_writer import SceneFileWriter
+
+
+class FrameWriterThread(threading.Thread):
+    # Writes frames to ffmpeg's stdin from a separate thread, so that the
+    # scene can rasterize the next frame while the last one is encoded
+    # (the write releases the GIL). Frames are written straight from the
+    # arrays' memory, without frame.tostring(). At most max_frames frames
+    # wait in the queue; past that write() blocks until ffmpeg catches up.
+    #
+    # The scene must not change a frame after handing it over, which
+    # holds for the arrays Scene.get_frame returns.
+    def __init__(self, stream, max_frames = 8):
+        threading.Thread.__init__(self, daemon = True)
+        self.stream = stream
+        self.frames = queue.Queue(maxsize = max_frames)
+        self.error = None
+        # seconds spent in stream.write, i.e. waiting for ffmpeg
+        self.write_time = 0
+
+    def run(self):
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                return
+            if self.error is None:
+                start = time.perf_counter()
+                try:
+                    self.stream.write(frame.data)
+                except Exception as error:
+                    # keep draining the queue, so that write() never blocks forever
+                    self.error = error
+                self.write_time += time.perf_counter() - start
+
+    def check_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def write(self, frame):
+        self.check_error()
+        self.frames.put(frame)
+
+    def close(self):
+        self.frames.put(None)
+        self.join()
+        self.check_error()
+
+
+class ThreadedSceneFileWriter(SceneFileWriter):
+    # With max_queued_frames = 0 there is no thread: every frame is written
+    # (still without a copy) before the next one is drawn, so no more than
+    # one frame is ever held for ffmpeg.
+    #
+    # write_time adds up the time spent writing frames to ffmpeg, on the
+    # writer thread or not, for all movie pipes of the scene so far.
+    CONFIG = {
+        "max_queued_frames": 8,
+    }
+
+    def __init__(self, scene, **kwargs):
+        super().__init__(scene, **kwargs)
+        self.write_time = 0
+
+    def open_movie_pipe(self):
+        super().open_movie_pipe()
+        self.frame_thread = None
+        if self.max_queued_frames > 0:
+            self.frame_thread = FrameWriterThread(self.writing_process.stdin, self.max_queued_frames)
+            self.frame_thread.start()
+
+    def write_frame(self, frame):
+        if not self.write_to_movie:
+            return
+        if self.frame_thread is None:
+            start = time.perf_counter()
+            self.writing_process.stdin.write(frame.data)
+            self.write_time += time.perf_counter() - start
+        else:
+            self.frame_thread.write(frame)
+
+    def close_movie_pipe(self):
+        if self.frame_thread is not None:
+            self.frame_thread.close()
+            self.write_time += self.frame_thread.write_time
+        super().close_movie_pipe()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+import os
+import re
+
+import numpy as np
+
+from manimlib.constants import *
+from manimlib.mobject.coordinate_systems import Axes, NumberPlane
+from manimlib.mobject.geometry import Rectangle
+from manimlib.mobject.numbers import DecimalNumber
+from manimlib.mobject.svg.tex_mobject import SingleStringTexMobject
+from manimlib.mobject.types.vectorized_mobject import VGroup, VMobject
+from manimlib.utils.config_ops import digest_config, merge_dicts_recursively
+from manimlib.utils.strings import split_string_list_to_isolate_substrings
+
+from cache import cached_tex, config_hash, dump_pickle, load_pickle
+
+# Labels made only of numerals, signs and a few symbols are put together
+# from an atlas of glyph outlines instead of being typeset by LaTeX. The
+# atlas is typeset once, by build_glyph_atlas(), and kept next to this file,
+# so that it can be committed: scenes then start without LaTeX installed.
+
+ATLAS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glyph_atlas.pkl")
+
+# the tex of every glyph, as it is typeset in the atlas; signs and
+# punctuation are braced so that TeX doesn't space them as operators
+ATLAS_GLYPHS = dict(
+    [(str(digit), str(digit)) for digit in range(10)] + [
+        ("-", "{-}"),
+        ("+", "{+}"),
+        (".", "."),
+        (",", "{,}"),
+        ("\\pi", "\\pi"),
+        ("\\theta", "\\theta"),
+    ]
+)
+
+# every glyph is typeset between two of these, which mark where TeX put
+# the glyph (the right edge of the first one), where it would have put the
+# next one (the left edge of the second one), and the baseline (their bottom)
+ATLAS_RULE = "\\rule{0.4pt}{1ex}"
+
+TOKEN_PATTERN = re.compile(r"\\[a-zA-Z]+|\S")
+
+# the TexMobject keyword arguments GlyphTex understands; anything else
+# is typeset by LaTeX as usual
+GLYPH_TEX_KWARGS = [
+    "color",
+    "fill_color",
+    "fill_opacity",
+    "stroke_color",
+    "stroke_width",
+    "stroke_opacity",
+    "background_stroke_color",
+    "background_stroke_width",
+    "background_stroke_opacity",
+    "tex_to_color_map",
+]
+
+
+def get_atlas_key():
+    return config_hash(TEMPLATE_TEX_FILE_BODY, ATLAS_RULE, sorted(ATLAS_GLYPHS.items()))
+
+
+def build_glyph_atlas():
+    # one LaTeX run for all the glyphs, laid out in a single line
+    cells = [ATLAS_RULE + tex + ATLAS_RULE for tex in ATLAS_GLYPHS.values()]
+    line = SingleStringTexMobject(" \\quad ".join(cells))
+    members = line.family_members_with_points()
+    rules = sorted(
+        (m for m in members if isinstance(m, Rectangle)),
+        key = lambda m: m.get_center()[0],
+    )
+    outlines = sorted(
+        (m for m in members if not isinstance(m, Rectangle)),
+        key = lambda m: m.get_center()[0],
+    )
+    if len(rules) != 2 * len(cells) or len(outlines) != len(cells):
+        raise Exception("Unexpected glyph atlas: {} rules and {} outlines for {} glyphs".format(
+            len(rules), len(outlines), len(cells),
+        ))
+
+    glyphs = {}
+    for i, (name, outline) in enumerate(zip(ATLAS_GLYPHS, outlines)):
+        before, after = rules[2 * i], rules[2 * i + 1]
+        pen = before.get_right()[0]
+        baseline = before.get_bottom()[1]
+        # outlines relative to the point TeX placed them at, and how far
+        # that point moves on to the next glyph
+        glyphs[name] = (
+            outline.points - np.array([pen, baseline, 0]),
+            after.get_left()[0] - pen,
+        )
+    return {"key": get_atlas_key(), "glyphs": glyphs}
+
+
+atlas_glyphs = None
+
+
+def get_glyph_atlas():
+    global atlas_glyphs
+    if atlas_glyphs is None:
+        atlas = load_pickle(ATLAS_PATH)
+        if atlas is None or atlas["key"] != get_atlas_key():
+            atlas = build_glyph_atlas()
+            dump_pickle(atlas, ATLAS_PATH)
+        atlas_glyphs = atlas["glyphs"]
+    return atlas_glyphs
+
+
+def get_glyph_names(tex_string):
+    return TOKEN_PATTERN.findall(tex_string)
+
+
+def is_glyph_tex(*tex_strings, **kwargs):
+    return (
+        all(key in GLYPH_TEX_KWARGS for key in kwargs) and
+        all(name in ATLAS_GLYPHS for s in tex_strings for name in get_glyph_names(s))
+    )
+
+
+class GlyphTex(VMobject):
+    # A TexMobject for strings of atlas glyphs, e.g. GlyphTex("3", "\\pi"):
+    # the glyphs are placed where TeX would place them in the same line,
+    # with TexMobject's style, parts and tex_to_color_map, so the result
+    # looks the same without running LaTeX.
+    CONFIG = {
+        "stroke_width": 0,
+        "fill_opacity": 1.0,
+        "background_stroke_width": 1,
+        "background_stroke_color": BLACK,
+        "tex_to_color_map": {},
+    }
+
+    def __init__(self, *tex_strings, **kwargs):
+        digest_config(self, kwargs)
+        self.tex_strings = [
+            s.strip() for s in split_string_list_to_isolate_substrings(
+                tex_strings, *self.tex_to_color_map.keys()
+            )
+            if s.strip() != ""
+        ]
+        self.tex_string = " ".join(self.tex_strings)
+        VMobject.__init__(self, **kwargs)
+        for tex, color in self.tex_to_color_map.items():
+            for part in self.submobjects:
+                if tex in part.tex_string:
+                    part.set_color(color)
+
+    def generate_points(self):
+        glyphs = get_glyph_atlas()
+        pen = 0
+        for tex_string in self.tex_strings:
+            part = VMobject()
+            part.tex_string = tex_string
+            for name in get_glyph_names(tex_string):
+                points, advance = glyphs[name]
+                glyph = VMobject()
+                glyph.points = points + pen * RIGHT
+                part.add(glyph)
+                pen += advance
+            self.add(part)
+        self.center()
+
+
+def glyph_tex(*tex_strings, **kwargs):
+    # a drop in replacement for cached_tex, which doesn't need LaTeX
+    # for the strings GlyphTex can put together
+    if is_glyph_tex(*tex_strings, **kwargs):
+        return GlyphTex(*tex_strings, **kwargs)
+    return cached_tex(*tex_strings, **kwargs)
+
+
+class GlyphDecimalNumber(DecimalNumber):
+    # DecimalNumber, with its characters taken from the atlas rather than
+    # typeset one at a time, for real numbers without a unit or ellipsis
+    def __init__(self, number = 0, **kwargs):
+        VMobject.__init__(self, **kwargs)
+        self.number = number
+        self.initial_config = kwargs
+
+        num_string = self.get_formatter().format(number)
+        rounded_num = np.round(number, self.num_decimal_places)
+        if num_string.startswith("-") and rounded_num == 0:
+            if self.include_sign:
+                num_string = "+" + num_string[1:]
+            else:
+                num_string = num_string[1:]
+
+        self.add(*[GlyphTex(char, **kwargs) for char in num_string])
+
+        # the rest is laid out exactly as DecimalNumber does it
+        if num_string.startswith("-"):
+            minus = self.submobjects[0]
+            minus.next_to(self.submobjects[1], LEFT, buff = self.digit_to_digit_buff)
+
+        self.arrange(buff = self.digit_to_digit_buff, aligned_edge = DOWN)
+
+        for i, c in enumerate(num_string):
+            if c == "-" and len(num_string) > i + 1:
+                self[i].align_to(self[i + 1], UP)
+                self[i].shift(self[i + 1].get_height() * DOWN / 2)
+            elif c == ",":
+                self[i].shift(self[i].get_height() * DOWN / 2)
+        if self.include_background_rectangle:
+            self.add_background_rectangle()
+
+
+class GlyphAxesMixin(object):
+    # Axes whose numbers (include_numbers) are GlyphDecimalNumbers
+    def create_axis(self, min_val, max_val, axis_config):
+        config = merge_dicts_recursively(self.axis_config, axis_config)
+        axis = super().create_axis(min_val, max_val, dict(axis_config, include_numbers = False))
+        if config.get("include_numbers"):
+            self.add_glyph_numbers(axis)
+        return axis
+
+    def add_glyph_numbers(self, axis):
+        # NumberLine.add_numbers, with GlyphDecimalNumber for DecimalNumber
+        axis.numbers = VGroup(*[
+            GlyphDecimalNumber(number, **axis.decimal_number_config).scale(axis.number_scale_val).next_to(
+                axis.number_to_point(number),
+                direction = axis.label_direction,
+                buff = axis.line_to_number_buff,
+            )
+            for number in axis.default_numbers_to_display()
+        ])
+        axis.add(axis.numbers)
+
+
+class GlyphAxes(GlyphAxesMixin, Axes):
+    pass
+
+
+class GlyphNumberPlane(GlyphAxesMixin, NumberPlane):
+    pass
+
+
+def main():
+    atlas = build_glyph_atlas()
+    dump_pickle(atlas, ATLAS_PATH)
+    print("Wrote {} glyphs to {}".format(len(atlas["glyphs"]), ATLAS_PATH))
+
+
+if __name__ == "__main__":
+    main()
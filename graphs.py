@@ -0,0 +1,199 @@
+import numpy as np
+
+from manimlib.constants import *
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.utils.bezier import interpolate, partial_bezier_points
+
+from cache import config_hash, graph_cache
+from clipping import get_visible_intervals
+
+
+class LiveGraph(VMobject):
+    # A graph plotted while the scene runs. self.points is always a view
+    # into a preallocated buffer, so extending the graph never reallocates
+    # the whole array.
+    #
+    # It can be used in two ways:
+    #   * live, through start_new_path/add_line_to, which behave like the
+    #     VMobject methods but grow the buffer geometrically, or
+    #   * precomputed, through plot() once and reveal_to(t) every frame,
+    #     which only changes how much of the finished curve is visible.
+    #     The plot can be sampled adaptively, and cached (see plot()).
+    CONFIG = {
+        "initial_capacity": 1024,
+    }
+
+    def reset_points(self):
+        self.buffer = np.zeros((self.initial_capacity, self.dim))
+        self.n_points = 0
+        self.points = self.buffer[:0]
+        self.curves = None
+        self.tail_index = None
+
+    def adopt_points(self):
+        # self.points was replaced from outside (become, restore, a
+        # transform...), so start again from a fresh buffer holding it
+        if self.points.base is self.buffer and len(self.points) == self.n_points:
+            return
+        points = np.array(self.points)
+        self.buffer = np.zeros((max(self.initial_capacity, 2 * len(points)), self.dim))
+        self.buffer[:len(points)] = points
+        self.n_points = len(points)
+        self.points = self.buffer[:self.n_points]
+
+    def reserve(self, n_points):
+        if n_points <= len(self.buffer):
+            return
+        new_buffer = np.zeros((max(n_points, 2 * len(self.buffer)), self.dim))
+        new_buffer[:self.n_points] = self.buffer[:self.n_points]
+        self.buffer = new_buffer
+
+    def append_points(self, new_points):
+        self.adopt_points()
+        new_points = np.asarray(new_points)
+        end = self.n_points + len(new_points)
+        self.reserve(end)
+        self.buffer[self.n_points:end] = new_points
+        self.n_points = end
+        self.points = self.buffer[:end]
+        return self
+
+    def start_new_path(self, point):
+        return self.append_points([point])
+
+    def add_line_to(self, point):
+        self.adopt_points()
+        last = self.buffer[self.n_points - 1]
+        handles_and_anchor = [interpolate(last, point, a) for a in (1 / 3, 2 / 3, 1)]
+        if self.has_new_path_started():
+            return self.append_points(handles_and_anchor)
+        return self.append_points([last] + handles_and_anchor)
+
+    def plot(self, function, t_min, t_max, t_step, discontinuities = (),
+             tolerance = None, min_t_step = None, bounds = None, cache_key = None):
+        # Precompute the graph of function (t -> point). Each discontinuity
+        # ends one piece and starts the next, so the graph never draws a line
+        # across an asymptote.
+        #
+        # Without a tolerance the graph is made of straight segments, t_step
+        # apart. With one, t_step is only the longest step: every piece is
+        # made of cubic curves matching the function and its derivative at
+        # their ends, and each curve is split in half (down to min_t_step)
+        # until its middle is within tolerance of the function. Flat
+        # stretches get few anchors, peaks and asymptotes many.
+        #
+        # With bounds (see clipping.py), the graph also breaks wherever it
+        # leaves them, and nothing outside of them is sampled.
+        #
+        # Plots with a cache_key are shared between scenes and runs, so the
+        # key has to identify the function itself as well.
+        key = None
+        if cache_key is not None:
+            key = "graph_{}".format(config_hash(
+                cache_key, t_min, t_max, t_step, list(discontinuities), tolerance, min_t_step,
+                None if bounds is None else [corner.tolist() for corner in bounds],
+            ))
+            cached = graph_cache.get(key)
+            if cached is not None:
+                self.curves, self.t_starts, self.t_ends = cached
+                return self.show_plot()
+
+        if min_t_step is None:
+            min_t_step = t_step / 64
+        edges = sorted([t_min, t_max] + [t for t in discontinuities if t_min < t < t_max])
+        curves = []
+        t_starts = []
+        t_ends = []
+        for t0, t1 in zip(edges[:-1], edges[1:]):
+            # stay a little away from the discontinuities themselves
+            offset = t_step / 2 if tolerance is None else min_t_step / 2
+            lo = t0 + (offset if t0 in discontinuities else 0)
+            hi = t1 - (offset if t1 in discontinuities else 0)
+            if hi <= lo:
+                continue
+            intervals = [(lo, hi)]
+            if bounds is not None:
+                intervals = get_visible_intervals(function, lo, hi, t_step, bounds)
+            for lo, hi in intervals:
+                if tolerance is None:
+                    piece = sample_uniformly(function, lo, hi, t_step)
+                else:
+                    piece = sample_adaptively(function, lo, hi, t_step, min_t_step, tolerance)
+                curves += piece[0]
+                t_starts += piece[1]
+                t_ends += piece[2]
+
+        self.curves = np.array(curves).reshape((-1, self.dim))
+        self.t_starts = np.array(t_starts)
+        self.t_ends = np.array(t_ends)
+        if key is not None:
+            graph_cache.put(key, (self.curves, self.t_starts, self.t_ends))
+        return self.show_plot()
+
+    def show_plot(self):
+        self.buffer = np.array(self.curves)
+        self.tail_index = None
+        return self.reveal_to(self.t_starts[0] if len(self.t_starts) else 0)
+
+    def reveal_to(self, t):
+        # show the precomputed graph up to t, ending in the part of the
+        # curve containing t that comes before it
+        if self.tail_index is not None:
+            i = self.tail_index
+            self.buffer[4 * i:4 * i + 4] = self.curves[4 * i:4 * i + 4]
+            self.tail_index = None
+
+        n_curves = np.searchsorted(self.t_ends, t, side = "right")
+        if n_curves < len(self.t_ends) and self.t_starts[n_curves] < t:
+            t0, t1 = self.t_starts[n_curves], self.t_ends[n_curves]
+            self.buffer[4 * n_curves:4 * n_curves + 4] = partial_bezier_points(
+                self.curves[4 * n_curves:4 * n_curves + 4], 0, (t - t0) / (t1 - t0)
+            )
+            self.tail_index = n_curves
+            n_curves += 1
+
+        self.n_points = 4 * n_curves
+        self.points = self.buffer[:self.n_points]
+        return self
+
+
+def sample_uniformly(function, t_min, t_max, t_step):
+    # straight segments t_step apart
+    ts = np.append(np.arange(t_min, t_max, t_step), t_max)
+    anchors = np.array([function(t) for t in ts])
+    curves = []
+    for a0, a1 in zip(anchors[:-1], anchors[1:]):
+        curves += [a0, interpolate(a0, a1, 1 / 3), interpolate(a0, a1, 2 / 3), a1]
+    return curves, list(ts[:-1]), list(ts[1:])
+
+
+def sample_adaptively(function, t_min, t_max, max_t_step, min_t_step, tolerance, dt = 1e-6):
+    def sample(t):
+        # the point and the (numerical) derivative of function at t
+        return function(t), (function(t + dt) - function(t - dt)) / (2 * dt)
+
+    curves = []
+    t_starts = []
+    t_ends = []
+
+    def add_curve(t0, s0, t1, s1):
+        (p0, d0), (p1, d1) = s0, s1
+        h = t1 - t0
+        curve = [p0, p0 + d0 * h / 3, p1 - d1 * h / 3, p1]
+        if h > min_t_step:
+            t_mid = (t0 + t1) / 2
+            s_mid = sample(t_mid)
+            middle = (curve[0] + 3 * curve[1] + 3 * curve[2] + curve[3]) / 8
+            if np.linalg.norm(middle - s_mid[0]) > tolerance:
+                add_curve(t0, s0, t_mid, s_mid)
+                add_curve(t_mid, s_mid, t1, s1)
+                return
+        curves.extend(curve)
+        t_starts.append(t0)
+        t_ends.append(t1)
+
+    ts = np.linspace(t_min, t_max, int(np.ceil((t_max - t_min) / max_t_step)) + 1)
+    samples = [sample(t) for t in ts]
+    for t0, s0, t1, s1 in zip(ts[:-1], samples[:-1], ts[1:], samples[1:]):
+        add_curve(t0, s0, t1, s1)
+    return curves, t_starts, t_ends
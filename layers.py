@@ -0,0 +1,296 @@
+import numpy as np
+
+from manimlib.constants import FRAME_WIDTH
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.scene.scene import Scene
+from manimlib.utils.iterables import list_update
+
+
+class StaticLayerScene(Scene):
+    # Scene.play only reuses the mobjects drawn below the first one that
+    # moves, and draws everything above it again on every frame, even if
+    # it never changes. This scene sorts the mobjects (in drawing order)
+    # into runs that move and runs that don't. The runs that don't move
+    # are rasterized once per play and pasted between the moving ones.
+    #
+    # A mobject counts as moving if it, or any mobject containing it, is
+    # animated or has an updater. Anything moved by another mobject's
+    # updater has to get an updater of its own.
+    #
+    # With dirty_regions, a frame isn't drawn from scratch either: only the
+    # rectangles around the parts of moving mobjects that changed since the
+    # previous frame (where they were, and where they are now) are drawn
+    # again, on top of the previous frame.
+    #
+    # With low_memory, the layers of a play hold at most one frame's worth
+    # of pixels between them (the rest is drawn every frame). The frame
+    # they are rasterized on is kept for the whole scene either way: the
+    # camera keeps a cairo context, and with it the pixels, of every
+    # array it has drawn on.
+    CONFIG = {
+        "cache_static_layers": True,
+        "dirty_regions": False,
+        # above this share of the frame, everything is simply redrawn
+        "max_dirty_fraction": 0.5,
+        "low_memory": False,
+    }
+
+    def setup(self):
+        super().setup()
+        self.frame_layers = None
+        self.layer_scratch = None
+        self.dirty_state = None
+
+    def get_moving_family(self, animations):
+        roots = [animation.mobject for animation in animations]
+        roots += self.foreground_mobjects
+        roots += [
+            mob for mob in self.get_mobject_family_members()
+            if mob.get_updaters()
+        ]
+        return set(id(member) for mob in roots for member in mob.get_family())
+
+    def get_frame_layers(self, animations):
+        moving = self.get_moving_family(animations)
+        members = self.camera.extract_mobject_family_members(
+            list_update(self.mobjects, self.foreground_mobjects)
+        )
+
+        runs = []
+        for member in members:
+            is_moving = id(member) in moving
+            if runs and runs[-1][0] == is_moving:
+                runs[-1][1].append(member)
+            else:
+                runs.append((is_moving, [member]))
+
+        # everything below the first moving run is the background, which
+        # Scene.progress_through_animations already draws only once
+        if runs and not runs[0][0]:
+            runs.pop(0)
+        layers = []
+        cached_pixels = 0
+        max_pixels = self.camera.get_pixel_width() * self.camera.get_pixel_height()
+        for is_moving, run in runs:
+            if not is_moving:
+                layer = self.rasterize_layer(run)
+                size = 0 if layer is None else layer[1].shape[0] * layer[1].shape[1]
+                if not self.low_memory or cached_pixels + size <= max_pixels:
+                    cached_pixels += size
+                    layers.append((False, layer))
+                    continue
+            layers.append((True, run))
+        return {
+            "moving_mobjects": [member for _, run in runs for member in run],
+            "layers": layers,
+        }
+
+    def rasterize_layer(self, mobjects):
+        # draw mobjects on a transparent frame, and keep the part of it
+        # they cover, together with 255 - alpha for compositing
+        camera = self.camera
+        if self.layer_scratch is None or self.layer_scratch.shape != camera.pixel_array.shape:
+            self.layer_scratch = np.zeros_like(camera.pixel_array)
+        scratch = self.layer_scratch
+        scratch[:] = 0
+
+        frame = camera.pixel_array
+        camera.pixel_array = scratch
+        try:
+            # only these members themselves, a moving submobject of one of
+            # them is drawn in its own layer
+            self.capture_mobjects_in_camera(
+                [mob for mob in mobjects if len(mob.points) > 0],
+                include_submobjects = False,
+            )
+        finally:
+            camera.pixel_array = frame
+
+        alpha = scratch[:, :, 3]
+        rows = np.flatnonzero(alpha.any(axis = 1))
+        cols = np.flatnonzero(alpha.any(axis = 0))
+        if len(rows) == 0:
+            return None
+        region = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        pixels = scratch[region].copy()
+        return region, pixels, 255 - pixels[:, :, 3:].astype(np.uint16)
+
+    def composite_layer(self, layer, rect = None):
+        # cairo's pixels are premultiplied, so this is "over":
+        # frame = layer + frame * (1 - layer_alpha)
+        if layer is None:
+            return
+        region, pixels, transparency = layer
+        if rect is not None:
+            # only the part of the layer inside rect
+            y0, y1, x0, x1 = rect
+            top, left = region[0].start, region[1].start
+            y0, y1 = max(y0, top), min(y1, region[0].stop)
+            x0, x1 = max(x0, left), min(x1, region[1].stop)
+            if y0 >= y1 or x0 >= x1:
+                return
+            region = (slice(y0, y1), slice(x0, x1))
+            local = (slice(y0 - top, y1 - top), slice(x0 - left, x1 - left))
+            pixels, transparency = pixels[local], transparency[local]
+        frame = self.camera.pixel_array[region]
+        frame[:] = pixels + (frame * transparency + 127) // 255
+
+    def progress_through_animations(self, animations):
+        if not self.cache_static_layers:
+            return super().progress_through_animations(animations)
+        self.frame_layers = self.get_frame_layers(animations)
+        try:
+            super().progress_through_animations(animations)
+        finally:
+            self.frame_layers = None
+
+    def get_moving_mobjects(self, *animations):
+        if self.frame_layers is not None:
+            return self.frame_layers["moving_mobjects"]
+        return super().get_moving_mobjects(*animations)
+
+    def update_frame(self, mobjects = None, background = None, **kwargs):
+        layers = self.frame_layers
+        if layers is None or mobjects is not layers["moving_mobjects"]:
+            self.dirty_state = None
+            return super().update_frame(mobjects, background, **kwargs)
+
+        state = self.get_dirty_state(layers) if self.dirty_regions else None
+        if state is None or not self.update_dirty_regions(layers, background, state):
+            super().update_frame([], background, **kwargs)
+            for is_moving, layer in layers["layers"]:
+                if is_moving:
+                    self.capture_mobjects_in_camera(layer)
+                else:
+                    self.composite_layer(layer)
+        self.dirty_state = state
+
+    # dirty regions
+
+    def get_dirty_state(self, layers):
+        # what every moving mobject looked like when this frame was drawn
+        members = {}
+        for is_moving, run in layers["layers"]:
+            if not is_moving:
+                continue
+            for mob in run:
+                for member in mob.family_members_with_points():
+                    if not isinstance(member, VMobject):
+                        return None
+                    members[id(member)] = (member, np.array(member.points), self.get_style_key(member))
+        return {"layers": layers, "time": self.time, "members": members}
+
+    def get_style_key(self, vmobject):
+        return (
+            vmobject.get_fill_rgbas().tobytes(),
+            vmobject.get_stroke_rgbas().tobytes(),
+            vmobject.get_stroke_rgbas(background = True).tobytes(),
+            np.array(vmobject.get_stroke_width()).tobytes(),
+            np.array(vmobject.get_stroke_width(background = True)).tobytes(),
+        )
+
+    def get_footprint(self, vmobject, points):
+        # the pixels a curve with these control points can touch, as
+        # (y0, y1, x0, x1), or None. With miter joins a stroke can stick out
+        # up to 10 times half its width beyond the curve.
+        if len(points) == 0:
+            return None
+        camera = self.camera
+        coords = camera.points_to_pixel_coords(vmobject, points)
+        widths = [np.max(vmobject.get_stroke_width(background = b)) for b in (False, True)]
+        line_width = max(widths) * camera.cairo_line_width_multiple * camera.get_pixel_width() / FRAME_WIDTH
+        pad = int(np.ceil(5 * line_width)) + 2
+        x0, y0 = coords.min(axis = 0) - pad
+        x1, y1 = coords.max(axis = 0) + pad + 1
+        y0, y1 = max(y0, 0), min(y1, camera.get_pixel_height())
+        x0, x1 = max(x0, 0), min(x1, camera.get_pixel_width())
+        if y0 >= y1 or x0 >= x1:
+            return None
+        return (int(y0), int(y1), int(x0), int(x1))
+
+    def get_changed_footprints(self, vmobject, old_points, new_points):
+        # only the cubic curves whose control points differ
+        n_common = min(len(old_points), len(new_points))
+        changed = np.any(old_points[:n_common] != new_points[:n_common], axis = 1)
+        nppc = vmobject.n_points_per_cubic_curve
+        rows = np.flatnonzero(changed)
+        curves = np.unique(rows // nppc)
+        common_rows = (curves[:, np.newaxis] * nppc + np.arange(nppc)).flatten()
+        common_rows = common_rows[common_rows < n_common]
+        start = (n_common // nppc) * nppc
+        return [
+            self.get_footprint(vmobject, np.vstack([points[common_rows], points[start:]]))
+            for points in (old_points, new_points)
+        ]
+
+    def update_dirty_regions(self, layers, background, state):
+        # redraw only what changed since the previous frame, if that was
+        # drawn from the same layers right before this one
+        old_state = self.dirty_state
+        if old_state is None or old_state["layers"] is not layers or background is None:
+            return False
+        if abs(self.time - old_state["time"] - 1 / self.camera.frame_rate) > 1e-6:
+            return False
+
+        rects = []
+        old_members = old_state["members"]
+        for key, (member, points, style) in state["members"].items():
+            if key not in old_members:
+                rects.append(self.get_footprint(member, points))
+                continue
+            _, old_points, old_style = old_members[key]
+            if old_style != style:
+                rects += [self.get_footprint(member, old_points), self.get_footprint(member, points)]
+            elif len(old_points) != len(points) or np.any(old_points != points):
+                rects += self.get_changed_footprints(member, old_points, points)
+        for key, (member, old_points, _) in old_members.items():
+            if key not in state["members"]:
+                rects.append(self.get_footprint(member, old_points))
+
+        rects = merge_rects([rect for rect in rects if rect is not None])
+        area = sum((y1 - y0) * (x1 - x0) for y0, y1, x0, x1 in rects)
+        if area > self.max_dirty_fraction * self.camera.get_pixel_width() * self.camera.get_pixel_height():
+            return False
+
+        frame = self.camera.pixel_array
+        for y0, y1, x0, x1 in rects:
+            frame[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        if not rects:
+            return True
+
+        ctx = self.camera.get_cairo_context(frame)
+        for is_moving, layer in layers["layers"]:
+            if not is_moving:
+                for rect in rects:
+                    self.composite_layer(layer, rect)
+                continue
+            # draw the moving mobjects clipped to the dirty rectangles
+            matrix = ctx.get_matrix()
+            ctx.save()
+            ctx.identity_matrix()
+            for y0, y1, x0, x1 in rects:
+                ctx.rectangle(x0, y0, x1 - x0, y1 - y0)
+            ctx.clip()
+            ctx.set_matrix(matrix)
+            self.capture_mobjects_in_camera(layer)
+            ctx.restore()
+        return True
+
+
+def merge_rects(rects):
+    # merge overlapping (y0, y1, x0, x1) rectangles until none overlap
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(rects)):
+            for j in range(i + 1, len(rects)):
+                a, b = rects[i], rects[j]
+                if a[0] < b[1] and b[0] < a[1] and a[2] < b[3] and b[2] < a[3]:
+                    rects[i] = (min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3]))
+                    rects.pop(j)
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+import argparse
+import gc
+import os
+import resource
+import time
+
+from cache import graph_cache, mobject_cache, tex_cache
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+
+def get_rss_mb():
+    # the memory the process holds right now, where /proc tells
+    try:
+        with open("/proc/self/statm") as fp:
+            resident_pages = int(fp.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError):
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MemoryMixin(object):
+    # Renders with low_memory (see StaticLayerScene and UnitCircleScene),
+    # samples the memory of the process after every frame and keeps the
+    # peak of every phase (see TrigFunctionScene.phases).
+    #
+    # Whenever memory is above memory_budget_mb, the mobjects the caches
+    # keep in memory are dropped (they stay on disk) and garbage is
+    # collected, and the frame is counted as over budget.
+    CONFIG = {
+        "low_memory": True,
+        "memory_budget_mb": None,
+    }
+
+    def setup(self):
+        super().setup()
+        self.phase_memory = []
+        self.current_phase_memory = None
+        for name in getattr(self, "phases", None) or []:
+            setattr(self, name, self.get_phase_wrapper(name, getattr(self, name)))
+
+    def get_phase_wrapper(self, name, phase):
+        def run_phase(*args, **kwargs):
+            self.begin_phase_memory(name)
+            phase(*args, **kwargs)
+            self.end_phase_memory()
+        return run_phase
+
+    def construct(self):
+        if getattr(self, "phases", None):
+            return super().construct()
+        self.begin_phase_memory("construct")
+        super().construct()
+        self.end_phase_memory()
+
+    def begin_phase_memory(self, name):
+        rss = get_rss_mb()
+        self.current_phase_memory = {
+            "phase": name,
+            "frames": 0,
+            "start_mb": rss,
+            "peak_mb": rss,
+            "over_budget": 0,
+        }
+        self.phase_memory.append(self.current_phase_memory)
+
+    def end_phase_memory(self):
+        self.sample_memory()
+        self.current_phase_memory = None
+
+    def add_frames(self, *frames):
+        super().add_frames(*frames)
+        if self.current_phase_memory is not None:
+            self.current_phase_memory["frames"] += len(frames)
+            self.sample_memory()
+
+    def sample_memory(self):
+        record = self.current_phase_memory
+        rss = get_rss_mb()
+        if self.memory_budget_mb is not None and rss > self.memory_budget_mb:
+            record["over_budget"] += 1
+            self.release_memory()
+            rss = get_rss_mb()
+        record["peak_mb"] = max(record["peak_mb"], rss)
+
+    def release_memory(self):
+        for cache in (mobject_cache, tex_cache, graph_cache):
+            cache.clear_memory()
+        gc.collect()
+
+
+def make_memory_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (MemoryMixin, scene_class), {})
+
+
+def render_with_memory_report(module_name, scene_name, quality, media_dir,
+                              low_memory = True, budget = None, write_to_movie = True):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    scene = make_memory_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": write_to_movie,
+            "input_file_path": module.__file__,
+        },
+        low_memory = low_memory,
+        memory_budget_mb = budget,
+    )
+    return scene.phase_memory
+
+
+def print_report(phase_memory):
+    print("\n{:<16}{:>8}{:>12}{:>12}{:>14}".format("phase", "frames", "start MB", "peak MB", "over budget"))
+    for record in phase_memory:
+        print("{:<16}{:>8}{:>12.0f}{:>12.0f}{:>14}".format(
+            record["phase"], record["frames"], record["start_mb"], record["peak_mb"], record["over_budget"],
+        ))
+    print("peak RSS of the process: {:.0f} MB".format(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render one scene with as little memory as possible, and report its peak memory by phase")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "production",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "--budget",
+        type = float,
+        help = "memory in MB above which caches are dropped",
+    )
+    parser.add_argument(
+        "--normal",
+        action = "store_true",
+        help = "render as usual, without low_memory, to compare",
+    )
+    parser.add_argument(
+        "--no_movie",
+        action = "store_true",
+        help = "don't write the movie file",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    phase_memory = render_with_memory_report(
+        args.module, args.scene, args.quality, args.media_dir,
+        low_memory = not args.normal,
+        budget = args.budget,
+        write_to_movie = not args.no_movie,
+    )
+    print_report(phase_memory)
+    print("rendered in {:.1f}s".format(time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
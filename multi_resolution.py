@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from manimlib.utils.iterables import list_update
+
+from frame_pipe import ThreadedSceneFileWriter
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+
+class SceneView(object):
+    # The scene, as seen by the file writer of another resolution: the same
+    # scene with another camera
+    def __init__(self, scene, camera):
+        self.scene = scene
+        self.camera = camera
+
+    def __getattr__(self, name):
+        return getattr(self.scene, name)
+
+
+class ResolutionOutput(object):
+    # One more resolution of a scene: a camera and a file writer, fed with
+    # every frame_step-th frame of the scene
+    def __init__(self, scene, camera_config):
+        config = dict(scene.camera_config, **camera_config)
+        self.camera = type(scene.camera)(**config)
+        if scene.camera.frame_rate % self.camera.frame_rate != 0:
+            raise Exception("A scene at {} frames per second can't be rendered at {} as well".format(
+                scene.camera.frame_rate, self.camera.frame_rate,
+            ))
+        self.frame_step = int(scene.camera.frame_rate // self.camera.frame_rate)
+        file_writer_config = dict(
+            scene.file_writer_config,
+            file_name = scene.file_writer.file_name or type(scene).__name__,
+            save_last_frame = False,
+        )
+        self.file_writer = ThreadedSceneFileWriter(SceneView(scene, self.camera), **file_writer_config)
+        self.in_play = False
+        self.play_frames = 0
+
+    def begin_play(self, allow_write):
+        self.file_writer.begin_animation(allow_write)
+        self.allow_write = allow_write
+        self.in_play = True
+        self.play_frames = 0
+
+    def end_play(self):
+        if self.in_play:
+            self.file_writer.end_animation(self.allow_write)
+            self.in_play = False
+
+    def get_frame_count(self, n_frames):
+        # how many of the scene's next n_frames frames of the play are ours
+        first = self.play_frames
+        self.play_frames += n_frames
+        return len(range(-first % self.frame_step, n_frames, self.frame_step))
+
+    def draw(self, mobjects):
+        self.camera.reset()
+        self.camera.capture_mobjects(mobjects)
+        return np.array(self.camera.get_pixel_array())
+
+    def write_frames(self, frame, n_frames):
+        for _ in range(n_frames):
+            self.file_writer.write_frame(frame)
+
+
+class MultiResolutionMixin(object):
+    # Renders the scene at several resolutions in one pass: the scene logic
+    # (updaters, animations, tex) runs once, at the resolution of the
+    # scene's camera, and every frame is also drawn from scratch by one
+    # camera per entry of extra_camera_configs, side by side in threads
+    # (cairo lets go of the GIL while it draws). Each resolution gets its
+    # own movie, in the directory a regular render at it would use.
+    #
+    # The frame rate of the scene has to be a multiple of the others; a
+    # lower one gets every n-th frame of every play. After a wait, that can
+    # be one frame more than a render at that frame rate would have.
+    CONFIG = {
+        "extra_camera_configs": [],
+    }
+
+    def setup(self):
+        super().setup()
+        self.extra_outputs = [
+            ResolutionOutput(self, camera_config)
+            for camera_config in self.extra_camera_configs
+        ]
+        self.output_executor = None
+        if len(self.extra_outputs) > 1:
+            self.output_executor = ThreadPoolExecutor(max_workers = len(self.extra_outputs))
+
+    def tear_down(self):
+        super().tear_down()
+        if self.output_executor is not None:
+            self.output_executor.shutdown()
+        for output in self.extra_outputs:
+            output.end_play()
+            output.file_writer.finish()
+
+    def update_skipping_status(self):
+        super().update_skipping_status()
+        # the partial movies of the other resolutions follow the scene's
+        for output in self.extra_outputs:
+            output.end_play()
+            output.begin_play(allow_write = not self.skip_animations)
+
+    def add_frames(self, *frames):
+        self.add_extra_frames(len(frames))
+        super().add_frames(*frames)
+
+    def add_extra_frames(self, n_frames):
+        jobs = [
+            (output, output.get_frame_count(n_frames))
+            for output in self.extra_outputs
+        ]
+        jobs = [(output, count) for output, count in jobs if count > 0]
+        if not jobs:
+            return
+        mobjects = list_update(self.mobjects, self.foreground_mobjects)
+        if self.output_executor is None:
+            frames = [output.draw(mobjects) for output, _ in jobs]
+        else:
+            # the mobjects mustn't change before every camera is done with them
+            frames = list(self.output_executor.map(lambda job: job[0].draw(mobjects), jobs))
+        for (output, count), frame in zip(jobs, frames):
+            output.write_frames(frame, count)
+
+
+def make_multi_resolution_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (MultiResolutionMixin, scene_class), {})
+
+
+def render_resolutions(module_name, scene_name, qualities, media_dir):
+    # the scene runs at the quality with the highest frame rate (then size)
+    qualities = sorted(qualities, key = lambda q: (
+        QUALITY_PRESETS[q]["frame_rate"], QUALITY_PRESETS[q]["pixel_height"],
+    ), reverse = True)
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    start = time.time()
+    make_multi_resolution_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[qualities[0]]),
+        file_writer_config = {
+            "write_to_movie": True,
+            "input_file_path": module.__file__,
+        },
+        extra_camera_configs = [dict(QUALITY_PRESETS[q]) for q in qualities[1:]],
+    )
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render one scene at several qualities in a single pass")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        action = "append",
+        choices = list(QUALITY_PRESETS),
+        help = "a quality to render at (can be repeated, defaults to low, high and production)",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    qualities = list(dict.fromkeys(args.quality or ["low", "high", "production"]))
+    elapsed = render_resolutions(args.module, args.scene, qualities, args.media_dir)
+    print("Rendered {} at {} in {:.1f}s".format(args.scene, ", ".join(qualities), elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,488 @@
+#!/usr/bin/env python
+import argparse
+import ast
+import copy
+import glob
+import importlib
+import io
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Client, Listener
+
+from PIL import Image
+
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+VIEWER_PAGE = b"""<!DOCTYPE html>
+<html>
+<head><title>preview</title></head>
+<body style="margin: 0; background: black; display: flex; height: 100vh">
+<img src="/stream" style="margin: auto; max-width: 100%; max-height: 100%">
+</body>
+</html>
+"""
+
+
+# which code changed, by function
+
+def get_definitions(source):
+    # the module level functions and the methods of module level classes,
+    # by qualified name, and a dump of everything else (imports, CONFIG, ...)
+    tree = ast.parse(source)
+    definitions = {}
+    rest = []
+    for node in tree.body:
+        if isinstance(node, FUNCTION_TYPES):
+            definitions[node.name] = node
+        elif isinstance(node, ast.ClassDef):
+            stripped = copy.copy(node)
+            stripped.body = []
+            for item in node.body:
+                if isinstance(item, FUNCTION_TYPES):
+                    definitions[node.name + "." + item.name] = item
+                else:
+                    stripped.body.append(item)
+            rest.append(stripped)
+        else:
+            rest.append(node)
+    return definitions, ast.dump(ast.Module(body = rest, type_ignores = []))
+
+
+def find_changes(old_source, new_source):
+    # the names of the functions that changed or were removed (ast.dump
+    # leaves out line numbers and comments), and whether anything outside
+    # of functions changed
+    old_definitions, old_rest = get_definitions(old_source)
+    new_definitions, new_rest = get_definitions(new_source)
+    changed = set(
+        name for name, node in old_definitions.items()
+        if name not in new_definitions or ast.dump(new_definitions[name]) != ast.dump(node)
+    )
+    return changed, old_rest != new_rest
+
+
+def get_definition_lines(source):
+    result = []
+    for name, node in get_definitions(source)[0].items():
+        start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        result.append((start, node.end_lineno, name))
+    return result
+
+
+def get_repo_sources():
+    return {
+        path: read_source(path)
+        for path in glob.glob(os.path.join(REPO_DIR, "*.py"))
+        if path != os.path.abspath(__file__)
+    }
+
+
+def read_source(path):
+    with open(path) as fp:
+        return fp.read()
+
+
+# the runner: renders the scene, and keeps a paused copy of itself (a forked
+# process) at the start of every phase to resume from
+
+class PreviewMixin(object):
+    # Streams the frames to the preview server as JPEGs, in real time,
+    # instead of writing them to a file. At the start of every phase (see
+    # TrigFunctionScene.phases) the process forks: the child renders on,
+    # while the parent stays behind as a checkpoint of the scene at that
+    # point. When the server asks a checkpoint to resume, it forks again,
+    # and the child reloads the repo's modules before running the phase,
+    # so it runs the edited code on the saved scene.
+    #
+    # Every phase reports the functions of the repo that ran during it,
+    # which is how the server knows which phases an edit affects.
+    CONFIG = {
+        "preview_address": None,
+        "preview_module": None,
+    }
+
+    def setup(self):
+        super().setup()
+        self.connect()
+        self.loaded_sources = get_repo_sources()
+
+    def connect(self):
+        self.connection = Client(self.preview_address)
+        self.send("runner", os.getpid())
+        self.clock_start = time.perf_counter()
+        self.clock_frames = 0
+
+    def send(self, *message):
+        self.connection.send(message)
+
+    def construct(self):
+        phases = getattr(self, "phases", None)
+        if not phases:
+            self.run_phase(0, super().construct)
+            return
+        for index, name in enumerate(phases):
+            self.checkpoint(index)
+            self.run_phase(index, lambda: getattr(self, name)())
+
+    def run_phase(self, index, phase):
+        self.send("start", index)
+        executed = set()
+
+        def profile(frame, event, arg):
+            if event == "call":
+                executed.add(frame.f_code)
+
+        sys.setprofile(profile)
+        try:
+            phase()
+        finally:
+            sys.setprofile(None)
+        self.send("done", index, self.get_executed_definitions(executed))
+
+    def get_executed_definitions(self, code_objects):
+        lines = {}
+        for code in code_objects:
+            path = os.path.abspath(code.co_filename)
+            if path in self.loaded_sources:
+                lines.setdefault(path, []).append(code.co_firstlineno)
+        result = set()
+        for path, first_lines in lines.items():
+            for start, end, name in get_definition_lines(self.loaded_sources[path]):
+                if any(start <= line <= end for line in first_lines):
+                    result.add((path, name))
+        return result
+
+    def checkpoint(self, index):
+        if os.fork() == 0:
+            self.connection.close()
+            self.connect()
+            return
+
+        # this process stays here, with the scene as it is, until killed
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        self.send("checkpoint", index, os.getpid())
+        while True:
+            try:
+                message = self.connection.recv()
+            except (EOFError, OSError):
+                os._exit(0)
+            if message[0] == "resume" and os.fork() == 0:
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                self.connection.close()
+                self.connect()
+                self.reload_scene_class()
+                return
+
+    def reload_scene_class(self):
+        modules = get_repo_modules()
+        for module in sort_by_imports(modules):
+            importlib.reload(module)
+        self.loaded_sources = get_repo_sources()
+        scene_class = getattr(sys.modules[self.preview_module], type(self).__name__)
+        self.__class__ = make_preview_scene_class(scene_class)
+
+    def add_frames(self, *frames):
+        super().add_frames(*frames)
+        last_frame, data = None, None
+        for frame in frames:
+            if frame is not last_frame:
+                last_frame, data = frame, encode_frame(frame)
+            self.wait_for_frame_time()
+            self.send("frame", data)
+
+    def wait_for_frame_time(self):
+        self.clock_frames += 1
+        delay = self.clock_start + self.clock_frames / self.camera.frame_rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -0.25:
+            # fell behind, so play on from now instead of catching up
+            self.clock_start = time.perf_counter()
+            self.clock_frames = 0
+
+
+def encode_frame(frame):
+    output = io.BytesIO()
+    Image.fromarray(frame).convert("RGB").save(output, "JPEG", quality = 85)
+    return output.getvalue()
+
+
+def get_repo_modules():
+    modules = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        # skips this file, which runs as __main__ (also known as __mp_main__)
+        if module.__name__ != "__main__" and path and os.path.dirname(os.path.abspath(path)) == REPO_DIR:
+            modules.append(module)
+    return modules
+
+
+def get_imported_names(path):
+    names = []
+    for node in ast.walk(ast.parse(read_source(path))):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return names
+
+
+def sort_by_imports(modules):
+    # dependencies first, so that reloading a module picks up the
+    # reloaded versions of what it imports
+    by_name = dict((module.__name__, module) for module in modules)
+    ordered = []
+    visited = set()
+
+    def visit(name):
+        if name not in by_name or name in visited:
+            return
+        visited.add(name)
+        for imported in get_imported_names(by_name[name].__file__):
+            visit(imported)
+        ordered.append(by_name[name])
+
+    for name in by_name:
+        visit(name)
+    return ordered
+
+
+def make_preview_scene_class(scene_class):
+    return type(scene_class.__name__, (PreviewMixin, scene_class), {})
+
+
+def run_scene(module_name, scene_name, quality, address, media_dir):
+    init_media_dirs(media_dir)
+    _, scene_class = load_scene_class(module_name, scene_name)
+    make_preview_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        preview_address = address,
+        preview_module = module_name,
+    )
+
+
+# the server: watches the files, decides where to resume, and serves the frames
+
+class PreviewServer(object):
+    def __init__(self, runner_args):
+        self.runner_args = runner_args
+        self.lock = threading.Condition()
+        self.frame = None
+        self.frame_count = 0
+        self.process = None
+        self.runner_pid = None
+        self.checkpoints = {}
+        self.executed = {}
+        self.running_phase = None
+        self.sources = get_repo_sources()
+
+        self.address = os.path.join(tempfile.mkdtemp(), "preview.sock")
+        self.listener = Listener(self.address)
+        threading.Thread(target = self.accept_connections, daemon = True).start()
+
+    def accept_connections(self):
+        while True:
+            connection = self.listener.accept()
+            threading.Thread(target = self.serve_connection, args = (connection,), daemon = True).start()
+
+    def serve_connection(self, connection):
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                return
+            kind = message[0]
+            with self.lock:
+                if kind == "frame":
+                    self.frame = message[1]
+                    self.frame_count += 1
+                    self.lock.notify_all()
+                elif kind == "runner":
+                    self.runner_pid = message[1]
+                elif kind == "start":
+                    self.running_phase = message[1]
+                elif kind == "done":
+                    self.executed[message[1]] = message[2]
+                    self.running_phase = None
+                elif kind == "checkpoint":
+                    # the runner stopped here, and a child of it runs on
+                    self.checkpoints[message[1]] = (message[2], connection)
+                    if self.runner_pid == message[2]:
+                        self.runner_pid = None
+
+    def kill(self, pid):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def stop(self):
+        with self.lock:
+            pids = [pid for pid, _ in self.checkpoints.values()] + [self.runner_pid]
+            self.checkpoints = {}
+            self.executed = {}
+            self.running_phase = None
+            self.runner_pid = None
+        for pid in pids:
+            if pid is not None:
+                self.kill(pid)
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+    def start_runner(self):
+        self.stop()
+        self.process = subprocess.Popen([
+            sys.executable, os.path.abspath(__file__),
+            "--address", self.address,
+        ] + self.runner_args)
+
+    def resume_from(self, index):
+        # the checkpoint forks a runner that reloads the code and runs on
+        # from the start of phase index
+        with self.lock:
+            for later in [i for i in self.checkpoints if i > index]:
+                self.kill(self.checkpoints.pop(later)[0])
+            for later in [i for i in self.executed if i >= index]:
+                del self.executed[later]
+            if self.runner_pid is not None:
+                self.kill(self.runner_pid)
+                self.runner_pid = None
+            self.running_phase = None
+            self.checkpoints[index][1].send(("resume",))
+
+    def get_resume_phase(self, changed):
+        # the first phase that ran any of the changed functions, or the one
+        # still running, since it runs the old code from here on
+        with self.lock:
+            phases = [index for index, executed in self.executed.items() if executed & changed]
+            if self.running_phase is not None:
+                phases.append(self.running_phase)
+            if not phases:
+                return None
+            index = min(phases)
+            return index if index in self.checkpoints else -1
+
+    def handle_changes(self, paths):
+        changed = set()
+        module_changed = False
+        new_sources = {}
+        for path in paths:
+            new_sources[path] = read_source(path)
+            try:
+                functions, rest = find_changes(self.sources.get(path, ""), new_sources[path])
+            except SyntaxError as error:
+                print("{}: {}".format(os.path.basename(path), error))
+                return
+            changed |= set((path, name) for name in functions)
+            module_changed = module_changed or rest
+        self.sources.update(new_sources)
+
+        index = -1 if module_changed else self.get_resume_phase(changed)
+        if index is None:
+            print("Nothing that ran changed")
+        elif index < 0:
+            print("Restarting the scene")
+            self.start_runner()
+        else:
+            print("Resuming from phase {}".format(index))
+            self.resume_from(index)
+
+    def watch(self, interval = 0.2):
+        mtimes = {}
+        for path in self.sources:
+            mtimes[path] = os.path.getmtime(path)
+        while True:
+            time.sleep(interval)
+            changed = []
+            for path in list(self.sources):
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if mtime != mtimes.get(path):
+                    mtimes[path] = mtime
+                    changed.append(path)
+            if changed:
+                self.handle_changes(changed)
+
+    def serve_http(self, port):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/stream":
+                    self.stream_frames()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.end_headers()
+                self.wfile.write(VIEWER_PAGE)
+
+            def stream_frames(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+                self.end_headers()
+                count = 0
+                while True:
+                    with server.lock:
+                        server.lock.wait_for(lambda: server.frame_count != count)
+                        count, frame = server.frame_count, server.frame
+                    try:
+                        self.wfile.write(b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + frame + b"\r\n")
+                    except OSError:
+                        return
+
+        http_server = ThreadingHTTPServer(("localhost", port), Handler)
+        http_server.daemon_threads = True
+        threading.Thread(target = http_server.serve_forever, daemon = True).start()
+        print("Preview at http://localhost:{}".format(port))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Preview a scene, re-running only the phases that changed")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "low",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument("--port", type = int, default = 8000)
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    # set by the server for the process that runs the scene
+    parser.add_argument("--address", help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.address:
+        run_scene(args.module, args.scene, args.quality, args.address, args.media_dir)
+        return
+
+    server = PreviewServer([args.module, args.scene, "-q", args.quality, "--media_dir", args.media_dir])
+    server.serve_http(args.port)
+    server.start_runner()
+    try:
+        server.watch()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
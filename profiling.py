@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+import manimlib
+from manimlib.scene.scene import Scene
+from manimlib.utils.simple_functions import get_parameters
+
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+MANIMLIB_DIR = os.path.dirname(os.path.abspath(manimlib.__file__))
+
+
+class ProfileMixin(object):
+    # Times every frame of the scene, split into updaters (each one on its
+    # own, labelled with the mobject that owns it), rasterization and
+    # encoding. Whatever is left of a frame is animation interpolation.
+    # Nothing about the rendered movie changes.
+    #
+    # Each entry of profile_frames is one call of add_frames, with the
+    # number of frames it added: a static wait() adds one frame many times.
+    #
+    # "encode" is the time add_frames takes. With a ThreadedSceneFileWriter
+    # (see frame_pipe.py) writing from its own thread, that is only the time
+    # spent waiting for room in its queue, i.e. how far ffmpeg falls behind;
+    # the time the writes to ffmpeg take is reported in the totals as "write".
+    def setup(self):
+        super().setup()
+        self.profile_plays = []
+        self.profile_frames = []
+        # the frame of the scene method running the current play or wait
+        self.profile_scene_frame = None
+        self.updater_times = defaultdict(float)
+        self.updater_calls = defaultdict(int)
+        self.mobject_labels = {}
+        self.frame_timings = self.get_empty_frame_timings()
+        self.last_frame_end = time.perf_counter()
+
+    def get_empty_frame_timings(self):
+        return {"updaters": 0, "raster": 0, "encode": 0}
+
+    def get_scene_frame(self):
+        # the innermost frame running one of the scene's own methods, such
+        # as draw_graph, rather than manim's or this file's code, or a
+        # mixin's override of a Scene method (see layers.py)
+        frame = sys._getframe(1)
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if frame.f_locals.get("self") is self \
+                    and not filename.startswith(MANIMLIB_DIR) \
+                    and filename != os.path.abspath(__file__) \
+                    and not is_scene_hook(frame.f_code.co_name):
+                return frame
+            frame = frame.f_back
+        return None
+
+    def get_mobject_label(self, mobject, scene_frame):
+        # the name the scene uses for the mobject: a local variable of the
+        # running scene method, or else an attribute of the scene
+        key = id(mobject)
+        if key in self.mobject_labels:
+            return self.mobject_labels[key]
+        candidates = list(scene_frame.f_locals.items()) if scene_frame is not None else []
+        candidates += [("self." + name, value) for name, value in vars(self).items()]
+        label = next(
+            (name for name, value in candidates if value is mobject),
+            "{}#{}".format(type(mobject).__name__, len(self.mobject_labels)),
+        )
+        self.mobject_labels[key] = label
+        return label
+
+    def update_skipping_status(self):
+        # called at the start of every play() and wait(), straight from the
+        # scene method that called them, where the updaters of the play
+        # are looked up as well
+        scene_frame = self.get_scene_frame()
+        self.profile_scene_frame = scene_frame
+        self.profile_plays.append({
+            "index": len(self.profile_plays),
+            "phase": scene_frame.f_code.co_name if scene_frame is not None else None,
+            "label": "wait",
+            "start_frame": len(self.profile_frames),
+            "start_time": time.perf_counter(),
+        })
+        super().update_skipping_status()
+
+    def begin_animations(self, animations):
+        if self.profile_plays:
+            self.profile_plays[-1]["label"] = ", ".join(str(a) for a in animations)
+        super().begin_animations(animations)
+
+    def update_mobjects(self, dt):
+        scene_frame = self.profile_scene_frame or self.get_scene_frame()
+        for mobject in self.mobjects:
+            self.timed_update(mobject, dt, scene_frame)
+
+    def timed_update(self, mobject, dt, scene_frame):
+        # the same as Mobject.update, with a clock around each updater
+        if mobject.updating_suspended:
+            return
+        for updater in mobject.updaters:
+            start = time.perf_counter()
+            if "dt" in get_parameters(updater):
+                updater(mobject, dt)
+            else:
+                updater(mobject)
+            elapsed = time.perf_counter() - start
+            label = self.get_mobject_label(mobject, scene_frame)
+            self.updater_times[label] += elapsed
+            self.updater_calls[label] += 1
+            self.frame_timings["updaters"] += elapsed
+        for submob in mobject.submobjects:
+            self.timed_update(submob, dt, scene_frame)
+
+    def update_frame(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().update_frame(*args, **kwargs)
+        self.frame_timings["raster"] += time.perf_counter() - start
+
+    def get_frame(self):
+        start = time.perf_counter()
+        result = super().get_frame()
+        self.frame_timings["raster"] += time.perf_counter() - start
+        return result
+
+    def add_frames(self, *frames):
+        start = time.perf_counter()
+        super().add_frames(*frames)
+        end = time.perf_counter()
+        self.frame_timings["encode"] += end - start
+
+        # wall time since the previous frame, so the first frame of a play
+        # also carries the setup of its animations
+        self.frame_timings["total"] = end - self.last_frame_end
+        self.frame_timings["play"] = len(self.profile_plays) - 1
+        # a wait adds the same frame many times, but it was made only once
+        self.frame_timings["frames"] = len(frames)
+        self.profile_frames.append(self.frame_timings)
+        self.frame_timings = self.get_empty_frame_timings()
+        self.last_frame_end = end
+
+    def get_profile(self):
+        keys = ["updaters", "raster", "encode", "total"]
+        plays = []
+        for play, next_play in zip(self.profile_plays, self.profile_plays[1:] + [None]):
+            end_frame = next_play["start_frame"] if next_play else len(self.profile_frames)
+            frames = self.profile_frames[play["start_frame"]:end_frame]
+            summary = dict(play, frames = sum(frame["frames"] for frame in frames))
+            summary.pop("start_time")
+            for key in keys:
+                summary[key] = sum(frame[key] for frame in frames)
+            plays.append(summary)
+
+        return {
+            "scene": type(self).__name__,
+            "frame_rate": self.camera.frame_rate,
+            "resolution": [self.camera.get_pixel_width(), self.camera.get_pixel_height()],
+            "totals": dict(
+                {key: sum(frame[key] for frame in self.profile_frames) for key in keys},
+                write = getattr(self.file_writer, "write_time", None),
+            ),
+            "plays": plays,
+            "updaters": {
+                label: {"calls": self.updater_calls[label], "time": self.updater_times[label]}
+                for label in sorted(self.updater_times, key = self.updater_times.get, reverse = True)
+            },
+            "frames": self.profile_frames,
+        }
+
+
+def is_scene_hook(name):
+    # play(), progress_through_animations()... as overridden by a mixin,
+    # but not construct(), which is where most scenes do everything
+    return name != "construct" and hasattr(Scene, name)
+
+
+def make_profiled_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (ProfileMixin, scene_class), {})
+
+
+def profile_scene(module_name, scene_name, quality, media_dir, write_to_movie = True):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    scene = make_profiled_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": write_to_movie,
+            "input_file_path": module.__file__,
+        },
+    )
+    profile = scene.get_profile()
+    profile["quality"] = quality
+    return profile
+
+
+def format_ms(seconds):
+    return "{:.1f}ms".format(1000 * seconds)
+
+
+def print_summary(profile, top = 10):
+    totals = profile["totals"]
+    n_frames = sum(frame["frames"] for frame in profile["frames"])
+    print("{} [{}]: {} frames in {:.1f}s".format(
+        profile["scene"], profile["quality"], n_frames, totals["total"]
+    ))
+
+    print("\n{:<12}{:>12}{:>12}{:>8}".format("stage", "time", "per frame", "share"))
+    other = totals["total"] - totals["updaters"] - totals["raster"] - totals["encode"]
+    for stage, seconds in [
+        ("updaters", totals["updaters"]),
+        ("raster", totals["raster"]),
+        ("encode", totals["encode"]),
+        ("animations", other),
+    ]:
+        print("{:<12}{:>12}{:>12}{:>7.0f}%".format(
+            stage,
+            "{:.2f}s".format(seconds),
+            format_ms(seconds / max(n_frames, 1)),
+            100 * seconds / max(totals["total"], 1e-9),
+        ))
+    if totals.get("write") is not None:
+        print("{:<12}{:>12}{:>12}  (writing to ffmpeg)".format(
+            "write",
+            "{:.2f}s".format(totals["write"]),
+            format_ms(totals["write"] / max(n_frames, 1)),
+        ))
+
+    print("\n{:<6}{:<20}{:>8}{:>10}{:>12}{:>10}{:>10}  {}".format(
+        "play", "phase", "frames", "time", "updaters", "raster", "encode", "animations"
+    ))
+    plays = sorted(profile["plays"], key = lambda p: p["total"], reverse = True)
+    for play in plays[:top]:
+        print("{:<6}{:<20}{:>8}{:>10}{:>12}{:>10}{:>10}  {}".format(
+            play["index"],
+            str(play["phase"]),
+            play["frames"],
+            "{:.2f}s".format(play["total"]),
+            "{:.2f}s".format(play["updaters"]),
+            "{:.2f}s".format(play["raster"]),
+            "{:.2f}s".format(play["encode"]),
+            play["label"][:60],
+        ))
+
+    print("\n{:<24}{:>10}{:>10}{:>12}".format("updater", "calls", "time", "per call"))
+    for label, stats in list(profile["updaters"].items())[:top]:
+        print("{:<24}{:>10}{:>10}{:>12}".format(
+            label,
+            stats["calls"],
+            "{:.2f}s".format(stats["time"]),
+            format_ms(stats["time"] / max(stats["calls"], 1)),
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render one scene and report where the time goes")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "low",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help = "file to write the full profile to, as JSON",
+    )
+    parser.add_argument(
+        "--top",
+        type = int,
+        default = 10,
+        help = "number of plays and updaters shown in the summary",
+    )
+    parser.add_argument(
+        "--no_movie",
+        action = "store_true",
+        help = "don't write the movie file (encode times will be zero)",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    profile = profile_scene(
+        args.module, args.scene, args.quality, args.media_dir,
+        write_to_movie = not args.no_movie,
+    )
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(profile, fp, indent = 1)
+    print_summary(profile, args.top)
+
+
+if __name__ == "__main__":
+    main()
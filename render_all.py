@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+import argparse
+import collections.abc
+import importlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from scene_index import find_scenes
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class QualityPresets(collections.abc.Mapping):
+    # The camera configs of manimlib's quality presets. They are looked up
+    # when first used, so that what only needs their names (the command
+    # line, finding the scenes) doesn't import manimlib.
+    NAMES = {
+        "low": "LOW_QUALITY_CAMERA_CONFIG",
+        "medium": "MEDIUM_QUALITY_CAMERA_CONFIG",
+        "high": "HIGH_QUALITY_CAMERA_CONFIG",
+        "production": "PRODUCTION_QUALITY_CAMERA_CONFIG",
+    }
+
+    def __getitem__(self, name):
+        import manimlib.constants
+        return getattr(manimlib.constants, self.NAMES[name])
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+
+QUALITY_PRESETS = QualityPresets()
+
+
+def find_scene_classes():
+    # from the source of the modules, see scene_index.py
+    return find_scenes()
+
+
+def init_media_dirs(media_dir):
+    import manimlib.constants
+    manimlib.constants.initialize_directories({
+        "media_dir": media_dir,
+        "video_dir": None,
+        "video_output_dir": None,
+        "tex_dir": None,
+    })
+
+
+def load_scene_class(module_name, scene_name):
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+    module = importlib.import_module(module_name)
+    return module, getattr(module, scene_name)
+
+
+def render_scene(module_name, scene_name, quality, media_dir):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+
+    start = time.time()
+    # constructing a scene renders it
+    scene_class(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": True,
+            "input_file_path": module.__file__,
+        },
+    )
+    return time.time() - start
+
+
+def render_job(job):
+    try:
+        return render_scene(*job), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def parse_scene_args(scene_args, default_qualities):
+    # "Sine" renders at the default qualities, "Tangent:low,high" overrides them
+    qualities = {}
+    for arg in scene_args:
+        name, _, presets = arg.partition(":")
+        qualities[name] = presets.split(",") if presets else default_qualities
+    return qualities
+
+
+def run_jobs(jobs, n_workers):
+    # yields (job, elapsed, error) for every job, as they finish
+    broken = []
+    with ProcessPoolExecutor(max_workers = n_workers) as executor:
+        futures = {executor.submit(render_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                elapsed, error = future.result()
+            except BrokenProcessPool:
+                broken.append(futures[future])
+                continue
+            yield futures[future], elapsed, error
+
+    # A worker that died (a crash in cairo, the OOM killer) takes the pool
+    # down, and with it every job still running or waiting. Those are
+    # rendered again, each in a pool of its own, so that only the job that
+    # crashed fails.
+    for i in range(0, len(broken), n_workers):
+        executors = {}
+        try:
+            for job in broken[i:i + n_workers]:
+                executor = ProcessPoolExecutor(max_workers = 1)
+                executors[executor.submit(render_job, job)] = (job, executor)
+            for future in as_completed(executors):
+                job, _ = executors[future]
+                try:
+                    elapsed, error = future.result()
+                except BrokenProcessPool:
+                    elapsed, error = None, "the worker process died:\n" + traceback.format_exc()
+                yield job, elapsed, error
+        finally:
+            for _, executor in executors.values():
+                executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render every scene in this repository in parallel")
+    parser.add_argument(
+        "scenes",
+        nargs = "*",
+        help = "scene names to render, optionally with qualities, e.g. Tangent:low,high",
+    )
+    parser.add_argument(
+        "-q", "--quality",
+        action = "append",
+        choices = list(QUALITY_PRESETS),
+        help = "quality preset(s) used when a scene doesn't name its own",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type = int,
+        default = os.cpu_count(),
+        help = "number of worker processes",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+        help = "directory to write media",
+    )
+    args = parser.parse_args()
+
+    default_qualities = args.quality or ["production"]
+    available = find_scene_classes()
+    if args.scenes:
+        qualities = parse_scene_args(args.scenes, default_qualities)
+        unknown = set(qualities) - set(name for _, name in available)
+        if unknown:
+            parser.error("unknown scene(s): {}".format(", ".join(sorted(unknown))))
+    else:
+        qualities = {name: default_qualities for _, name in available}
+
+    for name, presets in qualities.items():
+        for quality in presets:
+            if quality not in QUALITY_PRESETS:
+                parser.error("unknown quality '{}' for {}".format(quality, name))
+
+    jobs = [
+        (module_name, name, quality, args.media_dir)
+        for module_name, name in available if name in qualities
+        for quality in qualities[name]
+    ]
+
+    results = {}
+    start = time.time()
+    for job, elapsed, error in run_jobs(jobs, max(1, min(args.jobs, len(jobs)))):
+        _, name, quality, _ = job
+        results[(name, quality)] = elapsed
+        if error:
+            print("\n{} [{}] failed:\n{}".format(name, quality, error), file = sys.stderr)
+        else:
+            print("{} [{}] done in {:.1f}s".format(name, quality, elapsed))
+
+    print("\n{:<16}{:<12}{:>10}".format("scene", "quality", "time"))
+    for _, name, quality, _ in jobs:
+        elapsed = results[(name, quality)]
+        print("{:<16}{:<12}{:>10}".format(name, quality, "FAILED" if elapsed is None else "{:.1f}s".format(elapsed)))
+    print("total wall time: {:.1f}s".format(time.time() - start))
+
+    if None in results.values():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
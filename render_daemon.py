@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import parse_qs, urlsplit
+
+from cache import config_hash, graph_cache, mobject_cache, tex_cache
+from checkpoints import RENDER_CONFIG
+from glyphs import ATLAS_PATH, get_glyph_atlas
+from render_all import QUALITY_PRESETS, REPO_DIR, find_scene_classes, init_media_dirs, load_scene_class
+from scene_index import check_config
+
+# how many finished jobs are kept, for their status and the latency metrics
+HISTORY_SIZE = 1000
+
+# how often a job is tried again after the worker pool broke under it
+MAX_RETRIES = 1
+
+
+# in the worker processes
+
+def warm_up_worker(media_dir, scenes):
+    # everything a render would otherwise load first: the modules (and with
+    # them manimlib), the glyph atlas and the cached geometry and tex
+    init_media_dirs(media_dir)
+    for module_name, scene_name in scenes:
+        load_scene_class(module_name, scene_name)
+    if os.path.exists(ATLAS_PATH):
+        get_glyph_atlas()
+    # as much as their in-process layers keep (see DiskCache)
+    for cache in (mobject_cache, tex_cache, graph_cache):
+        cache.preload()
+
+
+def get_file_name(scene_name, config):
+    # variants of a scene get movies of their own, named by their config
+    if not config:
+        return scene_name
+    return "{}_{}".format(scene_name, config_hash(sorted(config.items())))
+
+
+def render_variant(module_name, scene_name, quality, media_dir, config):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    start = time.time()
+    # the CONFIG patch is merged into the scene's CONFIG like any keyword
+    # arguments, so nested dicts such as tex_config are patched key by key
+    scene = scene_class(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": True,
+            "input_file_path": module.__file__,
+            "file_name": get_file_name(scene_name, config),
+        },
+        **config
+    )
+    return scene.file_writer.get_movie_file_path(), time.time() - start
+
+
+def render_variant_job(job):
+    try:
+        return render_variant(*job), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+# in the daemon
+
+def get_percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return dict(
+        ("p{}".format(p), round(values[min(len(values) - 1, int(len(values) * p / 100))], 3))
+        for p in (50, 90, 99)
+    )
+
+
+class Job(object):
+    def __init__(self, job_id, module_name, scene_name, quality, config):
+        self.id = job_id
+        self.module_name = module_name
+        self.scene_name = scene_name
+        self.quality = quality
+        self.config = config
+        self.state = "queued"
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.render_time = None
+        self.movie_file_path = None
+        self.error = None
+        self.retries = 0
+        self.done = asyncio.Event()
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "scene": self.scene_name,
+            "quality": self.quality,
+            "config": self.config,
+            "state": self.state,
+            "queue_time": None if self.started is None else round(self.started - self.submitted, 3),
+            "render_time": None if self.render_time is None else round(self.render_time, 3),
+            "movie_file_path": self.movie_file_path,
+            "error": self.error,
+            "retries": self.retries,
+        }
+
+
+class RenderDaemon(object):
+    # Renders scenes on request, with CONFIG patches, e.g. another
+    # start_angle, sweep_run_times or tex_config. Jobs wait in an asyncio
+    # queue for one of n_workers worker processes. The workers live as
+    # long as the daemon and are warmed up once (see warm_up_worker), so
+    # a job only pays for building and rendering its scene.
+    def __init__(self, media_dir, n_workers):
+        self.media_dir = media_dir
+        self.n_workers = n_workers
+        self.scenes = dict((name, module_name) for module_name, name in find_scene_classes())
+        self.queue = asyncio.Queue()
+        self.jobs = collections.OrderedDict()
+        self.job_ids = itertools.count(1)
+        self.running = 0
+        self.counts = collections.Counter()
+        self.queue_times = collections.deque(maxlen = HISTORY_SIZE)
+        self.latencies = collections.deque(maxlen = HISTORY_SIZE)
+        self.executor = self.make_executor(n_workers)
+
+    def make_executor(self, n_workers):
+        return ProcessPoolExecutor(
+            max_workers = n_workers,
+            initializer = warm_up_worker,
+            initargs = (self.media_dir, sorted((module, name) for name, module in self.scenes.items())),
+        )
+
+    def replace_executor(self, broken):
+        # A worker that died (a crash in cairo, the OOM killer) breaks the
+        # whole pool, and with it every job running in it. The first job
+        # to notice starts a new pool, warmed up again.
+        if self.executor is broken:
+            self.executor = self.make_executor(self.n_workers)
+            self.counts["pool_restarts"] += 1
+            broken.shutdown(wait = False, cancel_futures = True)
+
+    def submit(self, request):
+        # returns the new job, or raises ValueError for a bad request
+        scene_name = request.get("scene")
+        if scene_name not in self.scenes:
+            raise ValueError("unknown scene: {}".format(scene_name))
+        quality = request.get("quality", "production")
+        if quality not in QUALITY_PRESETS:
+            raise ValueError("unknown quality: {}".format(quality))
+        config = request.get("config") or {}
+        if not isinstance(config, dict):
+            raise ValueError("config must be an object")
+        module_name = self.scenes[scene_name]
+        # checked against the source, the daemon itself never imports a scene
+        check_config(module_name, scene_name, config)
+        reserved = set(config) & set(RENDER_CONFIG)
+        if reserved:
+            raise ValueError("set by the daemon: {}".format(", ".join(sorted(reserved))))
+
+        job = Job(next(self.job_ids), module_name, scene_name, quality, config)
+        self.jobs[job.id] = job
+        while len(self.jobs) > HISTORY_SIZE and next(iter(self.jobs.values())).done.is_set():
+            self.jobs.popitem(last = False)
+        self.counts["submitted"] += 1
+        self.queue.put_nowait(job)
+        return job
+
+    async def run_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.state = "running"
+            job.started = time.time()
+            self.queue_times.append(job.started - job.submitted)
+            self.running += 1
+            result, error = await self.render(loop, job)
+            self.running -= 1
+            job.finished = time.time()
+            self.latencies.append(job.finished - job.submitted)
+            if error is None:
+                job.state = "done"
+                job.movie_file_path, job.render_time = result
+            else:
+                job.state = "failed"
+                job.error = error
+                print("job {} ({}) failed:\n{}".format(job.id, job.scene_name, error), file = sys.stderr)
+            self.counts[job.state] += 1
+            job.done.set()
+            self.queue.task_done()
+
+    async def render(self, loop, job):
+        args = (job.module_name, job.scene_name, job.quality, self.media_dir, job.config)
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, render_variant_job, args)
+        except BrokenProcessPool:
+            self.replace_executor(executor)
+            error = "a worker process died:\n" + traceback.format_exc()
+        except Exception:
+            return None, traceback.format_exc()
+
+        # The job may have broken the pool, or only have been running next
+        # to the job that did. It is tried again in a pool of its own, so
+        # that it can only break that one.
+        while job.retries < MAX_RETRIES:
+            job.retries += 1
+            executor = self.make_executor(1)
+            try:
+                return await loop.run_in_executor(executor, render_variant_job, args)
+            except BrokenProcessPool:
+                error = "a worker process died:\n" + traceback.format_exc()
+            except Exception:
+                return None, traceback.format_exc()
+            finally:
+                executor.shutdown(wait = False)
+        return None, error
+
+    def get_metrics(self):
+        return {
+            "workers": self.n_workers,
+            "queue_depth": self.queue.qsize(),
+            "running": self.running,
+            "jobs": dict(self.counts),
+            "queue_time": get_percentiles(list(self.queue_times)),
+            "latency": get_percentiles(list(self.latencies)),
+        }
+
+    # a small HTTP interface:
+    #   POST /jobs          {"scene": ..., "quality": ..., "config": {...}}
+    #   GET  /jobs/<id>     the state of a job
+    #   GET  /metrics       queue depth, and queue and total latency percentiles
+    # with ?wait=1, a request for a job answers once the job is finished
+
+    async def handle_request(self, method, target, body):
+        url = urlsplit(target)
+        wait = parse_qs(url.query).get("wait", ["0"])[0] not in ("", "0")
+        parts = [part for part in url.path.split("/") if part]
+        if method == "GET" and parts == ["metrics"]:
+            return 200, self.get_metrics()
+        if method == "POST" and parts == ["jobs"]:
+            try:
+                job = self.submit(json.loads(body or b"{}"))
+            except ValueError as error:
+                # json.JSONDecodeError is a ValueError too
+                return 400, {"error": str(error)}
+            if wait:
+                await job.done.wait()
+            return 202 if not wait else 200, job.to_dict()
+        if method == "GET" and len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = self.jobs.get(int(parts[1]))
+            if job is None:
+                return 404, {"error": "no job {}".format(parts[1])}
+            if wait:
+                await job.done.wait()
+            return 200, job.to_dict()
+        return 404, {"error": "not found"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            if len(request_line) < 2:
+                status, response = 400, {"error": "bad request"}
+            else:
+                try:
+                    status, response = await self.handle_request(request_line[0], request_line[1], body)
+                except Exception:
+                    status, response = 500, {"error": traceback.format_exc()}
+            data = json.dumps(response).encode()
+            writer.write("HTTP/1.0 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n".format(
+                status, "OK" if status < 400 else "Error", len(data),
+            ).encode() + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        workers = [asyncio.create_task(self.run_worker()) for _ in range(self.n_workers)]
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print("Rendering {} on http://{}:{} with {} workers".format(
+            ", ".join(sorted(self.scenes)), host, port, self.n_workers,
+        ))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.executor.shutdown(wait = False, cancel_futures = True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render scenes on request, with CONFIG patches, from warm worker processes")
+    parser.add_argument(
+        "-j", "--jobs",
+        type = int,
+        default = os.cpu_count(),
+        help = "number of worker processes",
+    )
+    parser.add_argument("--host", default = "localhost")
+    parser.add_argument("--port", type = int, default = 8100)
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+        help = "directory to write media",
+    )
+    args = parser.parse_args()
+
+    init_media_dirs(args.media_dir)
+    daemon = RenderDaemon(args.media_dir, max(1, args.jobs))
+    try:
+        asyncio.run(daemon.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
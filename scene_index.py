@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+import argparse
+import ast
+import importlib.util
+import os
+import pprint
+
+# The scenes of the repo and their CONFIG, read from the source of the
+# modules instead of importing them. A scene class can't exist without
+# manimlib, and importing any of manimlib imports all of it (manimlib's
+# __init__ imports every scene type, the camera and cairo), which takes
+# seconds. Finding the scenes, reading their CONFIG and checking a CONFIG
+# patch against it needs none of that; only rendering does.
+#
+# Classes are followed through the names a module defines or imports,
+# into manimlib's source as well, so the CONFIG of a scene is merged from
+# all of its base classes the way digest_config does it. CONFIG values
+# that aren't literals, like PI / 3 or np.sin, are kept as their source.
+#
+# Besides class statements, a module can define scenes in a VARIANTS list
+# of (name, base class, CONFIG) tuples (see variants.py).
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENE_CLASS = ("manimlib.scene.scene", "Scene")
+
+
+class SourceValue(object):
+    # a CONFIG value that is only known once the module is imported
+    def __init__(self, source):
+        self.source = source
+
+    def __repr__(self):
+        return self.source
+
+    def __eq__(self, other):
+        return isinstance(other, SourceValue) and other.source == self.source
+
+    def __hash__(self):
+        return hash(self.source)
+
+
+class ClassInfo(object):
+    def __init__(self, module_name, name, bases, config):
+        self.module_name = module_name
+        self.name = name
+        # the names of the base classes, in the module that uses them
+        self.bases = bases
+        self.config = config
+
+
+class ModuleInfo(object):
+    def __init__(self, module_name, path):
+        self.module_name = module_name
+        self.path = path
+        with open(path, encoding = "utf-8") as fp:
+            tree = ast.parse(fp.read(), path)
+        self.classes = {}
+        # name -> (module, name) for "from module import name"
+        self.imports = {}
+        self.star_imports = []
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                self.add_class(node.name, node.bases, self.get_class_config(node))
+            elif isinstance(node, ast.ImportFrom) and node.level == 0:
+                for alias in node.names:
+                    if alias.name == "*":
+                        self.star_imports.append(node.module)
+                    else:
+                        self.imports[alias.asname or alias.name] = (node.module, alias.name)
+            elif is_assignment_to(node, "VARIANTS") and isinstance(node.value, ast.List):
+                for entry in node.value.elts:
+                    if isinstance(entry, ast.Tuple) and len(entry.elts) == 3:
+                        name, base, config = entry.elts
+                        if isinstance(name, ast.Constant) and isinstance(name.value, str):
+                            self.add_class(name.value, [base], self.get_value(config))
+
+    def add_class(self, name, bases, config):
+        self.classes[name] = ClassInfo(
+            self.module_name, name,
+            [ast.unparse(base) for base in bases],
+            config if isinstance(config, dict) else {},
+        )
+
+    def get_class_config(self, node):
+        for statement in node.body:
+            if is_assignment_to(statement, "CONFIG"):
+                return self.get_value(statement.value)
+        return {}
+
+    def get_value(self, node):
+        # dicts stay dicts, so that nested ones can be merged key by key
+        if isinstance(node, ast.Dict) and all(
+            isinstance(key, ast.Constant) and isinstance(key.value, str)
+            for key in node.keys
+        ):
+            return dict(
+                (key.value, self.get_value(value))
+                for key, value in zip(node.keys, node.values)
+            )
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            return SourceValue(ast.unparse(node))
+
+
+def is_assignment_to(node, name):
+    return (
+        isinstance(node, ast.Assign) and len(node.targets) == 1
+        and isinstance(node.targets[0], ast.Name) and node.targets[0].id == name
+    )
+
+
+def find_module_path(module_name):
+    # where the source of a module is, without importing it (or the
+    # packages it's in)
+    if "." not in module_name:
+        path = os.path.join(REPO_DIR, module_name + ".py")
+        if os.path.exists(path):
+            return path
+    parts = module_name.split(".")
+    try:
+        spec = importlib.util.find_spec(parts[0])
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if len(parts) == 1:
+        return spec.origin if spec.origin and spec.origin.endswith(".py") else None
+    for directory in spec.submodule_search_locations or []:
+        base = os.path.join(directory, *parts[1:])
+        for path in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.exists(path):
+                return path
+    return None
+
+
+class SceneIndex(object):
+    def __init__(self):
+        self.modules = {}
+
+    def get_module(self, module_name):
+        if module_name not in self.modules:
+            path = find_module_path(module_name)
+            self.modules[module_name] = ModuleInfo(module_name, path) if path else None
+        return self.modules[module_name]
+
+    def resolve(self, module_name, name, seen = None):
+        # (module, name) of where the class called name in module_name is
+        # defined, or as far as its source could be followed
+        seen = seen or set()
+        if (module_name, name) in seen:
+            return None
+        seen.add((module_name, name))
+        module = self.get_module(module_name)
+        if module is None:
+            return (module_name, name)
+        if name in module.classes:
+            return (module_name, name)
+        if name in module.imports:
+            return self.resolve(*module.imports[name], seen = seen)
+        for star_module in reversed(module.star_imports):
+            found = self.resolve(star_module, name, seen)
+            if found is not None and self.get_class(found) is not None:
+                return found
+        return None
+
+    def get_class(self, ref):
+        module = self.get_module(ref[0])
+        if module is None:
+            return None
+        return module.classes.get(ref[1])
+
+    def get_bases(self, ref):
+        info = self.get_class(ref)
+        if info is None:
+            return []
+        # "manimlib.scene.scene.Scene" as well as "Scene"
+        bases = []
+        for base in info.bases:
+            module_name, _, name = base.rpartition(".")
+            if module_name:
+                bases.append((module_name, name))
+            else:
+                bases.append(self.resolve(ref[0], name))
+        return [base for base in bases if base is not None]
+
+    def get_mro(self, ref):
+        # depth first, left to right, which is the MRO for the single
+        # inheritance of the scenes here
+        mro = []
+        stack = [ref]
+        while stack:
+            current = stack.pop(0)
+            if current in mro:
+                continue
+            mro.append(current)
+            stack = self.get_bases(current) + stack
+        return mro
+
+    def is_scene(self, ref):
+        return SCENE_CLASS in self.get_mro(ref)
+
+    def get_config(self, ref):
+        config = {}
+        for base in reversed(self.get_mro(ref)):
+            info = self.get_class(base)
+            if info is not None:
+                config = merge_configs(config, info.config)
+        return config
+
+    def find_scenes(self):
+        scenes = []
+        for path in sorted(os.listdir(REPO_DIR)):
+            module_name, ext = os.path.splitext(path)
+            if ext != ".py":
+                continue
+            module = self.get_module(module_name)
+            scenes += [
+                (module_name, name) for name in sorted(module.classes)
+                if self.is_scene((module_name, name))
+            ]
+        # base scenes such as UnitCircleScene or ProjectionScene are only
+        # there to be subclassed, so only the leaves get rendered
+        bases = set(
+            base for scene in scenes
+            for base in self.get_mro(scene)[1:]
+        )
+        return [scene for scene in scenes if scene not in bases]
+
+
+def merge_configs(config, update):
+    # like manimlib's merge_dicts_recursively
+    result = dict(config)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge_configs(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+scene_index = SceneIndex()
+
+
+def find_scenes():
+    return scene_index.find_scenes()
+
+
+def get_scene_config(module_name, scene_name):
+    return scene_index.get_config((module_name, scene_name))
+
+
+def check_config(module_name, scene_name, config):
+    # raises ValueError for keys the scene's CONFIG doesn't have
+    unknown = set(config) - set(get_scene_config(module_name, scene_name))
+    if unknown:
+        raise ValueError("unknown CONFIG keys for {}: {}".format(scene_name, ", ".join(sorted(unknown))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "List the scenes and their CONFIG, without importing them")
+    parser.add_argument("scenes", nargs = "*", help = "scenes to print the CONFIG of")
+    args = parser.parse_args()
+
+    scenes = dict((name, module_name) for module_name, name in find_scenes())
+    if not args.scenes:
+        for name, module_name in sorted(scenes.items()):
+            print("{:<16}{}.py".format(name, module_name))
+        return
+    for name in args.scenes:
+        if name not in scenes:
+            parser.error("unknown scene: {}".format(name))
+        print("{} ({}.py)".format(name, scenes[name]))
+        pprint.pprint(get_scene_config(scenes[name], name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+import argparse
+import os
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import manimlib.constants as consts
+from manimlib.scene.scene import Scene, EndSceneEarlyException
+
+from frame_pipe import FrameWriterThread
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+# returned by get_frame() for a frame that was never rasterized,
+# because it fell outside of the segment being rendered
+STALE_FRAME = object()
+
+
+class SegmentMixin(object):
+    # Runs the scene logic (animations and updaters) for every frame, so
+    # ValueTracker state and anything updaters accumulate (like the growing
+    # tangent graph) come out exactly as in a full render, but only
+    # rasterizes and encodes the frames in [segment_start, segment_end)
+    CONFIG = {
+        "segment_start": 0,
+        "segment_end": None,
+        "segment_file": None,
+    }
+
+    def setup(self):
+        super().setup()
+        self.frame_index = 0
+        self.frame_is_stale = True
+        self.play_start_frames = []
+        self.segment_process = None
+        if self.segment_file is not None:
+            self.segment_process = open_segment_pipe(self.camera, self.segment_file)
+            self.segment_writer = FrameWriterThread(self.segment_process.stdin)
+            self.segment_writer.start()
+
+    def tear_down(self):
+        super().tear_down()
+        if self.segment_process is not None:
+            self.segment_writer.close()
+            self.segment_process.stdin.close()
+            self.segment_process.wait()
+
+    def in_segment(self, index):
+        if index < self.segment_start:
+            return False
+        return self.segment_end is None or index < self.segment_end
+
+    def update_skipping_status(self):
+        self.play_start_frames.append(self.frame_index)
+        super().update_skipping_status()
+
+    def update_frame(self, mobjects = None, background = None, **kwargs):
+        if not self.in_segment(self.frame_index):
+            self.frame_is_stale = True
+            return
+        if background is STALE_FRAME:
+            # the static background of this play was never drawn, draw everything
+            mobjects, background = None, None
+            kwargs.pop("excluded_mobjects", None)
+        super().update_frame(mobjects, background, **kwargs)
+        self.frame_is_stale = False
+
+    def get_frame(self):
+        if self.frame_is_stale:
+            return STALE_FRAME
+        return super().get_frame()
+
+    def add_frames(self, *frames):
+        redrawn = None
+        for frame in frames:
+            if self.in_segment(self.frame_index) and self.segment_process is not None:
+                if frame is STALE_FRAME:
+                    if redrawn is None:
+                        Scene.update_frame(self)
+                        redrawn = Scene.get_frame(self)
+                    frame = redrawn
+                self.segment_writer.write(frame)
+            self.frame_index += 1
+            self.increment_time(1 / self.camera.frame_rate)
+            if self.segment_end is not None and self.frame_index >= self.segment_end:
+                raise EndSceneEarlyException()
+
+
+def open_segment_pipe(camera, file_path):
+    # same encoding settings as SceneFileWriter.open_movie_pipe,
+    # so that segments can be joined without re-encoding
+    command = [
+        consts.FFMPEG_BIN,
+        '-y',
+        '-f', 'rawvideo',
+        '-s', '%dx%d' % (camera.get_pixel_width(), camera.get_pixel_height()),
+        '-pix_fmt', 'rgba',
+        '-r', str(camera.frame_rate),
+        '-i', '-',
+        '-an',
+        '-loglevel', 'error',
+        '-vcodec', 'libx264',
+        '-pix_fmt', 'yuv420p',
+        file_path,
+    ]
+    return subprocess.Popen(command, stdin = subprocess.PIPE)
+
+
+def make_segment_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (SegmentMixin, scene_class), {})
+
+
+def get_segment_directory(module_name, scene_name, quality):
+    preset = QUALITY_PRESETS[quality]
+    return os.path.join(
+        consts.VIDEO_DIR,
+        module_name,
+        "{}p{}".format(preset["pixel_height"], preset["frame_rate"]),
+        "segments",
+        scene_name,
+    )
+
+
+def count_frames(module_name, scene_name, quality, media_dir):
+    # a dry run with an empty segment executes every updater but draws nothing
+    init_media_dirs(media_dir)
+    _, scene_class = load_scene_class(module_name, scene_name)
+    scene = make_segment_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        segment_start = float("inf"),
+    )
+    return scene.frame_index, scene.play_start_frames
+
+
+def render_segment(module_name, scene_name, quality, media_dir, start, end, file_path):
+    init_media_dirs(media_dir)
+    _, scene_class = load_scene_class(module_name, scene_name)
+    make_segment_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        segment_start = start,
+        segment_end = end,
+        segment_file = file_path,
+    )
+    return file_path
+
+
+def split_frames(n_frames, n_segments, boundaries = None):
+    # evenly sized frame ranges, optionally snapped to the nearest play/wait start
+    cuts = [round(n_frames * i / n_segments) for i in range(1, n_segments)]
+    if boundaries:
+        cuts = [min(boundaries, key = lambda b: abs(b - cut)) for cut in cuts]
+    cuts = sorted(set(cut for cut in cuts if 0 < cut < n_frames))
+    edges = [0] + cuts + [n_frames]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def join_segments(file_paths, output_path):
+    file_list = os.path.join(os.path.dirname(file_paths[0]), "segment_file_list.txt")
+    with open(file_list, "w") as fp:
+        for path in file_paths:
+            fp.write("file \'file:{}\'\n".format(os.path.abspath(path)))
+    subprocess.check_call([
+        consts.FFMPEG_BIN,
+        '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', file_list,
+        '-loglevel', 'error',
+        '-c', 'copy',
+        '-an',
+        output_path,
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Render one scene in parallel, segment by segment")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "production",
+        choices = list(QUALITY_PRESETS),
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type = int,
+        default = os.cpu_count(),
+        help = "number of segments rendered side by side",
+    )
+    parser.add_argument(
+        "--split",
+        default = "frames",
+        choices = ["frames", "plays"],
+        help = "cut at fixed frame ranges, or only at play()/wait() boundaries",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    init_media_dirs(args.media_dir)
+    job = (args.module, args.scene, args.quality, args.media_dir)
+    n_frames, play_starts = count_frames(*job)
+    boundaries = play_starts if args.split == "plays" else None
+    ranges = split_frames(n_frames, max(1, args.jobs), boundaries)
+    print("{} frames in {} segments, counted in {:.1f}s".format(n_frames, len(ranges), time.time() - start))
+
+    segment_dir = get_segment_directory(args.module, args.scene, args.quality)
+    os.makedirs(segment_dir, exist_ok = True)
+    file_paths = [
+        os.path.join(segment_dir, "{:05}.mp4".format(i))
+        for i in range(len(ranges))
+    ]
+
+    with ProcessPoolExecutor(max_workers = len(ranges)) as executor:
+        futures = [
+            executor.submit(render_segment, *job, seg_start, seg_end, file_path)
+            for (seg_start, seg_end), file_path in zip(ranges, file_paths)
+        ]
+        for future in futures:
+            future.result()
+
+    output_path = os.path.join(os.path.dirname(os.path.dirname(segment_dir)), args.scene + ".mp4")
+    join_segments(file_paths, output_path)
+    print("File ready at {} ({:.1f}s)".format(output_path, time.time() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from manimlib.mobject.geometry import Circle, Square
+
+import cache
+from cache import DiskCache, cached_mobject, config_hash, get_function_key, get_tex_config_key
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_config_hash_is_deterministic():
+    config = {"radius": 1, "color": "#FFFFFF", "nested": {"stroke_width": 2}}
+    assert config_hash("Sine", config) == config_hash("Sine", dict(config))
+    assert len(config_hash("Sine", config)) == 16
+
+
+def test_config_hash_changes_with_the_config():
+    assert config_hash("Sine", {"radius": 1}) != config_hash("Sine", {"radius": 2})
+    assert config_hash("Sine", {"radius": 1}) != config_hash("Cosine", {"radius": 1})
+
+
+def make_scaled(factor):
+    return lambda t: factor * np.sin(t)
+
+
+def test_function_key_is_stable():
+    assert get_function_key(lambda t: np.sin(t)) == get_function_key(lambda t: np.sin(t))
+    assert get_function_key(make_scaled(2)) == get_function_key(make_scaled(2))
+    assert get_function_key(np.tan) == get_function_key(np.tan)
+
+
+def test_function_key_changes_with_the_code():
+    assert get_function_key(lambda t: np.sin(t)) != get_function_key(lambda t: np.cos(t))
+    assert get_function_key(lambda t: np.sin(t)) != get_function_key(lambda t: np.sin(t + 1))
+    assert get_function_key(np.tan) != get_function_key(np.sin)
+
+
+def test_function_key_changes_with_the_closure():
+    assert get_function_key(make_scaled(2)) != get_function_key(make_scaled(3))
+
+
+def test_function_key_ignores_addresses():
+    # a default that is an object without a useful repr
+    marker = object()
+    key = get_function_key(lambda t, m = marker: t)
+    assert "0x" not in repr(key)
+
+
+def test_disk_cache_round_trip(cache_dir):
+    disk_cache = DiskCache("test", max_size = 1 << 20)
+    assert disk_cache.get("key") is None
+    disk_cache.put("key", {"points": [1, 2, 3]})
+    assert disk_cache.get("key") == {"points": [1, 2, 3]}
+
+    # a new process only has what is on disk
+    assert DiskCache("test", max_size = 1 << 20).get("key") == {"points": [1, 2, 3]}
+    assert disk_cache.get_stats()["entries"] == 1
+
+
+def test_disk_cache_memory_is_bounded(cache_dir):
+    disk_cache = DiskCache("test", max_size = 1 << 20, max_memory_size = 2500)
+    for i in range(5):
+        disk_cache.put(str(i), bytes(1000))
+    assert disk_cache.memory_size <= 2500
+    assert list(disk_cache.memory) == ["3", "4"]
+
+    # what was dropped from memory is still on disk
+    assert disk_cache.get("0") == bytes(1000)
+    assert list(disk_cache.memory) == ["4", "0"]
+
+
+def test_disk_cache_keeps_recently_used_in_memory(cache_dir):
+    disk_cache = DiskCache("test", max_size = 1 << 20, max_memory_size = 2500)
+    disk_cache.put("a", bytes(1000))
+    disk_cache.put("b", bytes(1000))
+    disk_cache.get("a")
+    disk_cache.put("c", bytes(1000))
+    assert list(disk_cache.memory) == ["a", "c"]
+
+
+def test_disk_cache_evicts_from_disk(cache_dir):
+    disk_cache = DiskCache("test", max_size = 2500)
+    for i in range(5):
+        disk_cache.put(str(i), bytes(1000))
+    assert disk_cache.get_stats()["size"] <= 2500
+
+
+def test_disk_cache_preload(cache_dir):
+    disk_cache = DiskCache("test", max_size = 1 << 20)
+    disk_cache.put("a", [1])
+    disk_cache.put("b", [2])
+
+    fresh = DiskCache("test", max_size = 1 << 20)
+    assert fresh.preload() == 2
+    assert fresh.get_stats()["memory_entries"] == 2
+    assert fresh.get("b") == [2]
+
+
+def test_disk_cache_preload_without_a_directory(cache_dir):
+    assert DiskCache("missing", max_size = 1 << 20).preload() == 0
+
+
+def test_cached_mobject_is_keyed_by_its_builder(cache_dir):
+    disk_cache = DiskCache("test", max_size = 1 << 20)
+    config = {"stroke_width": 2}
+    first = cached_mobject("circle", config, lambda: Square(**config), cache = disk_cache)
+    again = cached_mobject("circle", config, lambda: Square(**config), cache = disk_cache)
+    other = cached_mobject("circle", config, lambda: Circle(**config), cache = disk_cache)
+    assert type(first) is type(again) is Square
+    assert type(other) is Circle
+    assert disk_cache.hits == 1
+
+
+def test_tex_config_key_keeps_only_the_colors_used():
+    sine = {"tex_to_color_map": {"\\pi": "#FF0000", "\\sin": "#800080"}}
+    tangent = {"tex_to_color_map": {"\\tan": "#0000FF", "\\pi": "#FF0000"}}
+    assert get_tex_config_key(["2", "\\pi"], sine) == get_tex_config_key(["2", "\\pi"], tangent)
+    assert get_tex_config_key(["\\sin\\theta"], sine) != get_tex_config_key(["\\sin\\theta"], tangent)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from clipping import cap_segment, clip_point, clip_segment, get_visible_intervals, is_inside
+
+BOUNDS = (np.array([-1.0, -1.0, -np.inf]), np.array([1.0, 1.0, np.inf]))
+
+
+def point(x, y):
+    return np.array([x, y, 0.0])
+
+
+def test_is_inside():
+    assert is_inside(point(0, 0), BOUNDS)
+    assert is_inside(point(1, -1), BOUNDS)
+    assert not is_inside(point(1.5, 0), BOUNDS)
+
+
+def test_nan_and_infinite_points_are_outside():
+    assert not is_inside(point(np.nan, 0), BOUNDS)
+    assert not is_inside(point(0, np.inf), BOUNDS)
+
+
+def test_clip_point_moves_onto_the_edge():
+    np.testing.assert_allclose(clip_point(point(3, 0.5), BOUNDS), point(1, 0.5))
+    np.testing.assert_allclose(clip_point(point(-np.inf, np.inf), BOUNDS), point(-1, 1))
+
+
+def test_clip_segment_inside_is_unchanged():
+    start, end = clip_segment(point(-0.5, 0), point(0.5, 0.5), BOUNDS)
+    np.testing.assert_allclose(start, point(-0.5, 0))
+    np.testing.assert_allclose(end, point(0.5, 0.5))
+
+
+def test_clip_segment_crossing_the_frame():
+    start, end = clip_segment(point(-2, 0), point(2, 0), BOUNDS)
+    np.testing.assert_allclose(start, point(-1, 0))
+    np.testing.assert_allclose(end, point(1, 0))
+
+
+def test_clip_segment_keeps_its_direction():
+    start, end = clip_segment(point(0, 0), point(4, 2), BOUNDS)
+    np.testing.assert_allclose(start, point(0, 0))
+    np.testing.assert_allclose(end, point(1, 0.5))
+
+
+def test_clip_segment_to_infinity():
+    start, end = clip_segment(point(0, 0.25), point(np.inf, 0.25), BOUNDS)
+    np.testing.assert_allclose(start, point(0, 0.25))
+    np.testing.assert_allclose(end, point(1, 0.25))
+
+
+def test_clip_segment_fully_off_frame():
+    # both ends end up on the same point of the edge, so nothing is drawn
+    start, end = clip_segment(point(2, 2), point(3, 5), BOUNDS)
+    np.testing.assert_allclose(start, end)
+    np.testing.assert_allclose(start, point(1, 1))
+
+
+def test_clip_segment_parallel_to_an_edge_outside():
+    start, end = clip_segment(point(-2, 2), point(2, 2), BOUNDS)
+    np.testing.assert_allclose(start, end)
+    assert is_inside(start, BOUNDS)
+
+
+def test_clip_segment_missing_a_corner():
+    # crosses the lines x = 1 and y = 1, but outside the frame
+    start, end = clip_segment(point(0.5, 2), point(2, 0.5), BOUNDS)
+    np.testing.assert_allclose(start, end)
+
+
+def test_cap_segment():
+    start, end = cap_segment(point(0, 0), point(10, 0), 2)
+    np.testing.assert_allclose(start, point(0, 0))
+    np.testing.assert_allclose(end, point(2, 0))
+    start, end = cap_segment(point(0, 0), point(1, 1), 2)
+    np.testing.assert_allclose(end, point(1, 1))
+
+
+def test_visible_intervals_break_at_an_asymptote():
+    bounds = (np.array([-10.0, -1.0, -np.inf]), np.array([10.0, 1.0, np.inf]))
+    intervals = get_visible_intervals(lambda t: point(t, np.tan(t)), 0, 3, 0.25, bounds)
+    assert len(intervals) == 2
+    (a0, a1), (b0, b1) = intervals
+    assert a0 == 0
+    assert abs(a1 - np.pi / 4) < 1e-9
+    assert abs(b0 - 3 * np.pi / 4) < 1e-9
+    assert b1 == 3
+
+
+def test_visible_intervals_of_a_function_off_frame():
+    assert get_visible_intervals(lambda t: point(t, 5 + np.sin(t)), 0, 3, 0.25, BOUNDS) == []
+
+
+def test_visible_intervals_of_a_function_inside():
+    assert get_visible_intervals(lambda t: point(0, np.sin(t)), 0, 10, 0.25, BOUNDS) == [(0, 10)]
@@ -0,0 +1,127 @@
+import numpy as np
+
+from graphs import LiveGraph, sample_adaptively, sample_uniformly
+
+
+def line(t):
+    return np.array([t, 2 * t, 0.0])
+
+
+def sine(t):
+    return np.array([t, np.sin(3 * t), 0.0])
+
+
+def tangent(t):
+    return np.array([t, np.tan(t), 0.0])
+
+
+def get_curves(graph):
+    return graph.points.reshape((-1, 4, 3))
+
+
+def test_sample_uniformly():
+    curves, t_starts, t_ends = sample_uniformly(line, 0, 1, 0.25)
+    curves = np.array(curves).reshape((-1, 4, 3))
+    assert len(curves) == 4
+    np.testing.assert_allclose(t_starts, [0, 0.25, 0.5, 0.75])
+    np.testing.assert_allclose(t_ends, [0.25, 0.5, 0.75, 1])
+    for curve, t0, t1 in zip(curves, t_starts, t_ends):
+        np.testing.assert_allclose(curve[0], line(t0))
+        np.testing.assert_allclose(curve[3], line(t1))
+
+
+def test_sample_uniformly_ends_at_t_max():
+    _, t_starts, t_ends = sample_uniformly(line, 0, 1, 0.3)
+    assert t_ends[-1] == 1
+    assert t_starts[1:] == t_ends[:-1]
+
+
+def test_sample_adaptively_is_within_tolerance():
+    tolerance = 1e-3
+    curves, t_starts, t_ends = sample_adaptively(sine, 0, 3, 0.5, 0.5 / 64, tolerance)
+    curves = np.array(curves).reshape((-1, 4, 3))
+    assert t_starts[0] == 0 and t_ends[-1] == 3
+    np.testing.assert_allclose(t_starts[1:], t_ends[:-1])
+    for curve, t0, t1 in zip(curves, t_starts, t_ends):
+        for a in (0.25, 0.5, 0.75):
+            weights = [(1 - a) ** 3, 3 * (1 - a) ** 2 * a, 3 * (1 - a) * a ** 2, a ** 3]
+            on_curve = np.dot(weights, curve)
+            # the curve runs along the function, not at the same speed, so
+            # compare with the closest of many points of the function
+            ts = np.linspace(t0, t1, 200)
+            distance = min(np.linalg.norm(on_curve - sine(t)) for t in ts)
+            assert distance < 2 * tolerance
+
+
+def test_sample_adaptively_refines_where_it_bends():
+    _, t_starts, t_ends = sample_adaptively(tangent, 0, 1.5, 0.25, 0.25 / 64, 1e-3)
+    steps = np.array(t_ends) - np.array(t_starts)
+    starts = np.array(t_starts)
+    # tan is much steeper close to its asymptote
+    assert steps[starts > 1.25].mean() < steps[starts < 0.5].mean()
+
+
+def test_sample_adaptively_stops_at_min_t_step():
+    _, t_starts, t_ends = sample_adaptively(tangent, 1.5, 1.57, 0.07, 0.01, 1e-9)
+    assert min(np.array(t_ends) - np.array(t_starts)) >= 0.01 / 2
+
+
+def test_plot_breaks_at_asymptotes():
+    graph = LiveGraph().plot(tangent, 0, np.pi, 0.1, discontinuities = [np.pi / 2], tolerance = 1e-3)
+    assert not any(t0 < np.pi / 2 < t1 for t0, t1 in zip(graph.t_starts, graph.t_ends))
+    curves = graph.curves.reshape((-1, 4, 3))
+    # the pieces on either side of the asymptote aren't joined
+    before = np.flatnonzero(graph.t_ends < np.pi / 2)[-1]
+    assert not np.allclose(curves[before][3], curves[before + 1][0])
+
+
+def test_plot_within_bounds():
+    bounds = (np.array([-10.0, -2.0, -np.inf]), np.array([10.0, 2.0, np.inf]))
+    graph = LiveGraph().plot(tangent, 0, np.pi, 0.1, discontinuities = [np.pi / 2], tolerance = 1e-3, bounds = bounds)
+    anchors = graph.curves.reshape((-1, 4, 3))[:, [0, 3]]
+    assert np.all(np.abs(anchors[:, :, 1]) <= 2 + 1e-6)
+    # one piece on each side of the asymptote
+    assert abs(graph.t_ends[graph.t_ends < np.pi / 2].max() - np.arctan(2)) < 1e-6
+
+
+def test_reveal_to_partway():
+    graph = LiveGraph().plot(line, 0, 1, 0.25)
+    graph.reveal_to(0.6)
+    curves = get_curves(graph)
+    assert len(curves) == 3
+    np.testing.assert_allclose(curves[-1][3], line(0.6))
+    np.testing.assert_allclose(curves[-1][0], line(0.5))
+
+
+def test_reveal_to_on_a_curve_boundary():
+    graph = LiveGraph().plot(line, 0, 1, 0.25)
+    graph.reveal_to(0.5)
+    assert len(get_curves(graph)) == 2
+    np.testing.assert_allclose(graph.points[-1], line(0.5))
+
+
+def test_reveal_to_restores_the_partial_curve():
+    graph = LiveGraph().plot(sine, 0, 1, 0.25)
+    graph.reveal_to(0.6)
+    graph.reveal_to(1)
+    np.testing.assert_allclose(graph.points, graph.curves)
+    graph.reveal_to(0.3)
+    graph.reveal_to(0.1)
+    graph.reveal_to(1)
+    np.testing.assert_allclose(graph.points, graph.curves)
+
+
+def test_reveal_to_before_the_start():
+    graph = LiveGraph().plot(line, 0, 1, 0.25)
+    graph.reveal_to(-1)
+    assert len(graph.points) == 0
+
+
+def test_live_path_grows_in_place():
+    graph = LiveGraph(initial_capacity = 4)
+    graph.start_new_path(line(0))
+    for t in np.linspace(0.1, 1, 10):
+        graph.add_line_to(line(t))
+    assert len(graph.points) == 4 * 10
+    assert graph.points.base is graph.buffer
+    np.testing.assert_allclose(graph.points[-1], line(1))
@@ -0,0 +1,30 @@
+from layers import merge_rects
+
+
+def test_merge_overlapping_rects():
+    assert merge_rects([(0, 10, 0, 10), (5, 15, 5, 15)]) == [(0, 15, 0, 15)]
+
+
+def test_disjoint_rects_are_kept():
+    rects = [(0, 10, 0, 10), (20, 30, 0, 10), (0, 10, 20, 30)]
+    assert merge_rects(rects) == rects
+
+
+def test_touching_rects_are_not_merged():
+    # (y0, y1, x0, x1) are half-open, so these share an edge but no pixel
+    rects = [(0, 10, 0, 10), (10, 20, 0, 10)]
+    assert merge_rects(rects) == rects
+
+
+def test_merge_chain():
+    # a and c don't overlap, but both overlap the union of a and b
+    a, b, c = (0, 10, 0, 10), (8, 20, 8, 12), (0, 4, 11, 30)
+    assert merge_rects([a, b, c]) == [(0, 20, 0, 30)]
+
+
+def test_merge_contained_rect():
+    assert merge_rects([(2, 4, 2, 4), (0, 10, 0, 10)]) == [(0, 10, 0, 10)]
+
+
+def test_merge_nothing():
+    assert merge_rects([]) == []
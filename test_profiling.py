@@ -0,0 +1,61 @@
+from manimlib.camera.camera import Camera
+from manimlib.constants import ORIGIN, RIGHT
+from manimlib.mobject.value_tracker import ValueTracker
+
+from layers import StaticLayerScene
+from profiling import make_profiled_scene_class
+from render_all import QUALITY_PRESETS, init_media_dirs
+from updaters import always_line
+
+
+class BlankCamera(Camera):
+    # the profile is the same whatever is drawn
+    def capture_mobjects(self, mobjects, **kwargs):
+        pass
+
+
+class LineScene(StaticLayerScene):
+    CONFIG = {
+        "camera_class": BlankCamera,
+    }
+
+    def construct(self):
+        self.draw_line()
+
+    def draw_line(self):
+        tracker = ValueTracker(0)
+        hor = always_line(lambda: ORIGIN, lambda: RIGHT * (1 + tracker.get_value()))
+        self.add(hor)
+        self.play(tracker.set_value, 1, run_time = 0.2)
+        self.wait(0.2)
+
+
+def profile_line_scene(tmp_path, **config):
+    init_media_dirs(str(tmp_path))
+    scene = make_profiled_scene_class(LineScene)(
+        camera_config = dict(QUALITY_PRESETS["low"]),
+        file_writer_config = {"write_to_movie": False},
+        **config
+    )
+    return scene.get_profile()
+
+
+def test_updaters_are_labelled_with_the_scenes_names(tmp_path):
+    # the play runs through StaticLayerScene.progress_through_animations,
+    # but hor is a local of draw_line
+    profile = profile_line_scene(tmp_path)
+    assert list(profile["updaters"]) == ["hor"]
+    assert [play["phase"] for play in profile["plays"]] == ["draw_line", "draw_line"]
+
+
+def test_updaters_are_labelled_without_static_layers(tmp_path):
+    profile = profile_line_scene(tmp_path, cache_static_layers = False)
+    assert list(profile["updaters"]) == ["hor"]
+
+
+def test_frames_are_counted_once(tmp_path):
+    profile = profile_line_scene(tmp_path)
+    frame_rate = profile["frame_rate"]
+    play, wait = profile["plays"]
+    assert play["frames"] == round(0.2 * frame_rate)
+    assert wait["frames"] == round(0.2 * frame_rate)
@@ -0,0 +1,105 @@
+import textwrap
+
+import pytest
+
+import scene_index
+from scene_index import SceneIndex, SourceValue, check_config, get_scene_config
+
+# A repo of its own, so that the tests need neither manimlib nor the
+# scenes here. scenes.Scene stands in for manimlib's Scene.
+MODULES = {
+    "scenes": """
+        class Scene(object):
+            CONFIG = {
+                "camera_config": {"background_color": "#000000", "frame_rate": 15},
+                "skip_animations": False,
+            }
+    """,
+    "circle": """
+        from scenes import *
+
+        class UnitCircleScene(Scene):
+            CONFIG = {
+                "radius": 1,
+                "start_angle": PI / 3,
+                "camera_config": {"frame_rate": 60},
+            }
+
+        class Bare(UnitCircleScene):
+            def construct(self):
+                pass
+
+        class Helper(object):
+            CONFIG = {"radius": 2}
+    """,
+    "trig": """
+        import numpy as np
+        import scenes
+        from circle import UnitCircleScene
+
+        class Sine(UnitCircleScene):
+            CONFIG = {"function": np.sin}
+
+        class Direct(scenes.Scene):
+            pass
+
+        VARIANTS = [
+            ("Cosine", UnitCircleScene, {"function": np.cos, "radius": 2}),
+        ]
+    """,
+}
+
+
+@pytest.fixture(autouse = True)
+def repo(tmp_path, monkeypatch):
+    for module_name, source in MODULES.items():
+        (tmp_path / (module_name + ".py")).write_text(textwrap.dedent(source))
+    monkeypatch.setattr(scene_index, "REPO_DIR", str(tmp_path))
+    monkeypatch.setattr(scene_index, "SCENE_CLASS", ("scenes", "Scene"))
+    monkeypatch.setattr(scene_index, "scene_index", SceneIndex())
+    return tmp_path
+
+
+def test_find_scenes_returns_the_leaves():
+    assert SceneIndex().find_scenes() == [
+        ("circle", "Bare"),
+        ("trig", "Cosine"),
+        ("trig", "Direct"),
+        ("trig", "Sine"),
+    ]
+
+
+def test_class_without_config_inherits_it():
+    assert get_scene_config("circle", "Bare") == get_scene_config("circle", "UnitCircleScene")
+
+
+def test_config_is_merged_from_the_bases():
+    config = get_scene_config("trig", "Sine")
+    assert config["radius"] == 1
+    assert config["skip_animations"] is False
+    # nested dicts are merged key by key
+    assert config["camera_config"] == {"background_color": "#000000", "frame_rate": 60}
+
+
+def test_variants_override_the_config():
+    config = get_scene_config("trig", "Cosine")
+    assert config["radius"] == 2
+    assert config["function"] == SourceValue("np.cos")
+
+
+def test_values_that_arent_literals_keep_their_source():
+    config = get_scene_config("trig", "Sine")
+    assert repr(config["start_angle"]) == "PI / 3"
+    assert repr(config["function"]) == "np.sin"
+
+
+def test_non_scene_classes_are_skipped():
+    index = SceneIndex()
+    assert not index.is_scene(("circle", "Helper"))
+    assert index.is_scene(index.resolve("circle", "Scene"))
+
+
+def test_check_config():
+    check_config("trig", "Sine", {"radius": 3, "camera_config": {}})
+    with pytest.raises(ValueError, match = "colour"):
+        check_config("trig", "Sine", {"radius": 3, "colour": "#FFFFFF"})
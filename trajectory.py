@@ -0,0 +1,62 @@
+import numpy as np
+
+from manimlib.animation.transform import Transform
+from manimlib.mobject.value_tracker import ValueTracker
+
+
+class ThetaFunction(object):
+    # Wraps a vectorized function of theta: an array of angles in, an array
+    # of results (one per angle) out. Called with a single angle it evaluates
+    # just that one, unless the angle was precomputed, in which case the
+    # result is only looked up.
+    __slots__ = ("func", "values")
+
+    def __init__(self, func):
+        self.func = func
+        self.values = {}
+
+    def precompute(self, thetas):
+        self.values = dict(zip(thetas.tolist(), self.func(thetas)))
+
+    def clear(self):
+        self.values = {}
+
+    def __call__(self, theta):
+        try:
+            return self.values[theta]
+        except KeyError:
+            return self.func(np.array([theta]))[0]
+
+
+def get_tracker_trajectory(animation, run_time, frame_rate):
+    # The value a ValueTracker takes on every frame of a Transform, computed
+    # with the same arithmetic as Animation.interpolate and straight_path, so
+    # that the values match what the tracker reports frame by frame exactly
+    if not isinstance(animation, Transform) or not isinstance(animation.mobject, ValueTracker):
+        return None
+    times = np.arange(0, run_time, 1 / frame_rate)
+    alphas = np.clip(times / animation.run_time, 0, 1)
+    alphas = get_rate_func_values(animation.rate_func, alphas)
+    if alphas is None:
+        return None
+    alphas = np.clip(alphas, 0, 1)
+    start = animation.starting_mobject.get_value()
+    end = animation.target_copy.get_value()
+    return (1 - alphas) * start + alphas * end
+
+
+def get_rate_func_values(rate_func, alphas):
+    # Rate functions are written for a single alpha. Most of them work on
+    # arrays as they are, but one with branches like "if t < 0.5" raises, or
+    # returns a single value. Those are called one alpha at a time, and if
+    # that fails too, the trajectory isn't precomputed (None).
+    try:
+        values = np.asarray(rate_func(alphas), dtype = float)
+        if values.shape == alphas.shape:
+            return values
+    except Exception:
+        pass
+    try:
+        return np.array([rate_func(alpha) for alpha in alphas], dtype = float)
+    except Exception:
+        return None
@@ -0,0 +1,361 @@
+from manimlib.imports import *
+
+from cache import cached_tex, get_function_key
+from clipping import cap_segment
+from glyphs import glyph_tex
+from graphs import LiveGraph
+from unit_circle import UnitCircleScene, toward
+from updaters import always_arc, always_brace, always_dot, always_line, set_center
+
+# Scenes for one trig function each, described entirely by CONFIG:
+#
+#   function          the graphed function of the angle, on floats and arrays
+#   asymptotes        angles in [0, graph_t_max] where the graph breaks
+#   function_tex      the label, used for the brace and above the graph
+#   graph_config,     the palette
+#   tex_config...
+#
+# plus the geometry of how the value is read off the unit circle, which
+# depends on the family (ProjectionScene or TangentLineScene).
+
+
+class TrigFunctionScene(UnitCircleScene):
+    CONFIG = {
+        "function": None,
+        "asymptotes": [],
+
+        "start_angle": PI / 3,
+        # (angle, run_time) pairs theta moves through while the brace is shown
+        "demo_angles": [],
+
+        "graph_t_max": 4.8 * PI,
+        # the graph is sampled adaptively (see LiveGraph.plot), in steps of
+        # at most graph_t_step, until it is within graph_tolerance of the
+        # function everywhere
+        "graph_t_step": 0.25,
+        "graph_tolerance": 0.005,
+        # values are clipped to this, so that functions like cot, which are
+        # infinite at theta = 0, still give points the camera can draw
+        "graph_value_bound": 1000,
+        "sweep_run_times": (15, 15),
+
+        "graph_config": {},
+        "perpend_config": {
+            "color": WHITE,
+        },
+
+        "arc_config": {
+            "radius": 0.5,
+        },
+        # the label of the arc, which spans theta + phase
+        "angle_tex": "\\theta",
+
+        # draw a line from get_link_point() to the graph during the second sweep
+        "draw_horizontal": False,
+
+        # the methods construct() runs, in order; each one picks up the
+        # scene where the one before left it
+        "phases": ["introduce", "show_graph", "draw_graph"],
+    }
+
+    def construct(self):
+        for phase in self.phases:
+            getattr(self, phase)()
+
+    def introduce(self):
+        raise NotImplementedError()
+
+    def get_link_point(self):
+        raise NotImplementedError()
+
+    def get_angle_label(self):
+        arc = always_arc(self.circle.get_center, self.get_angle, **self.arc_config)
+        label = glyph_tex(self.angle_tex, **self.tex_config)
+        label.add_updater(lambda l: set_center(l, self.angle_label_position(self.theta.get_value())))
+        return VGroup(arc, label)
+
+    def show_unit_brace(self):
+        # make sure that the radius is 1
+        brace = self.get_unit_brace()
+        self.play(GrowFromCenter(brace))
+        self.wait(2)
+        self.play(FadeOut(brace))
+
+    def show_demo_angles(self, brace, eq, angle_label, final_wait):
+        self.play(GrowFromCenter(brace), Write(eq))
+        self.wait(2)
+
+        for i, (angle, run_time) in enumerate(self.demo_angles):
+            self.play(self.theta.set_value, angle, run_time = run_time)
+            self.wait(0.5 if i < len(self.demo_angles) - 1 else final_wait)
+
+        self.play(FadeOut(brace), FadeOut(eq), FadeOut(angle_label))
+        self.play(ApplyMethod(self.theta.set_value, 0))
+        self.wait(1)
+
+    def get_graph_values(self, thetas):
+        with np.errstate(divide = "ignore"):
+            values = self.function(thetas + self.phase)
+        return np.clip(values, -self.graph_value_bound, self.graph_value_bound)
+
+    def get_graph(self):
+        # the whole curve is computed once and revealed up to theta every frame,
+        # with a break at each asymptote
+        return LiveGraph(**self.graph_config).plot(
+            lambda t: self.graph_plane.coords_to_point(t, self.get_graph_values(t)),
+            t_min = 0,
+            t_max = self.graph_t_max,
+            t_step = self.graph_t_step,
+            discontinuities = self.asymptotes,
+            tolerance = self.graph_tolerance,
+            bounds = self.frame_bounds,
+            cache_key = self.get_graph_cache_key(),
+        )
+
+    def get_graph_cache_key(self):
+        # the function by its code, and by a few of its values in case
+        # what it calls changed (np.tan has no code to compare)
+        samples = np.linspace(0.1, self.graph_t_max, 16) + np.sqrt(2) / 100
+        return (
+            get_function_key(self.function), self.get_graph_values(samples).tolist(),
+            self.phase, self.graph_value_bound, self.graph_plane_config,
+        )
+
+    def draw_graph(self):
+        graph = self.get_graph()
+        graph.add_updater(lambda g: g.reveal_to(self.theta.get_value()))
+
+        graph_point = self.theta_function(lambda thetas: self.graph_points(thetas, self.get_graph_values(thetas)))
+        axis_point = self.theta_function(lambda thetas: self.graph_points(thetas, np.zeros_like(thetas)))
+
+        dot = always_dot(lambda: graph_point(self.theta.get_value()), bounds = self.frame_bounds, **self.dot_config)
+
+        perpend = always_line(
+            lambda: graph_point(self.theta.get_value()),
+            lambda: axis_point(self.theta.get_value()),
+            bounds = self.frame_bounds,
+            **self.perpend_config
+        )
+
+        self.add(graph, perpend, dot)
+
+        first_run_time, second_run_time = self.sweep_run_times
+        self.play(ApplyMethod(self.theta.set_value, self.graph_t_max, rate_func = linear, run_time = first_run_time))
+        self.wait(2)
+
+        self.theta.set_value(0)
+        graph.reveal_to(0)
+        if self.draw_horizontal:
+            hor = always_line(
+                self.get_link_point,
+                lambda: graph_point(self.theta.get_value()),
+                bounds = self.frame_bounds,
+                color = YELLOW
+            )
+            self.add(hor)
+
+        self.play(ApplyMethod(self.theta.set_value, self.graph_t_max, rate_func = linear, run_time = second_run_time))
+        self.wait(3)
+
+
+class ProjectionScene(TrigFunctionScene):
+    # The value is the distance from the point on the circle to its
+    # projection onto the axis through the center along projection_axis,
+    # e.g. sine with RIGHT (the height above the x-axis) and cosine with UP.
+    CONFIG = {
+        "projection_axis": RIGHT,
+
+        "demo_angles": [
+            (0.1 * PI, 1),
+            (0.8 * PI, 1),
+            (-1, 2),
+            (PI / 6, 1),
+        ],
+
+        "arc_config": {
+            "stroke_width": 2,
+        },
+
+        "hypo_config": {
+            "color": WHITE,
+        },
+
+        "oppo_config": {},
+    }
+
+    def setup(self):
+        super().setup()
+        # the projection lines in the graph match the one on the circle
+        self.perpend_config = dict(self.perpend_config, **self.oppo_config)
+
+    def get_link_point(self):
+        return self.get_point_at_theta()
+
+    def introduce(self):
+        self.theta = ValueTracker(self.start_angle)
+
+        self.plane = self.get_plane()
+        self.circle = self.get_circle()
+
+        self.play(ShowCreation(self.plane), ShowCreation(self.circle))
+        self.wait(2)
+        self.show_unit_brace()
+
+        # show a point on the circle
+        dot = Dot(self.get_point_at_theta(), **self.dot_config)
+        hypo = always_line(self.circle.get_center, self.get_point_at_theta, **self.hypo_config)
+        angle_label = self.get_angle_label()
+
+        self.add_foreground_mobjects(dot) # the dot must be drawn above the line
+        self.play(ShowCreation(dot))
+        self.play(ShowCreation(hypo))
+        self.play(Write(angle_label))
+        self.wait(1)
+
+        axis = self.projection_axis
+        foot = self.theta_function(lambda thetas:
+            self.circle.get_center() + np.multiply.outer(
+                self.circle.get_width() / 2 * np.dot(toward(thetas + self.phase), axis), axis
+            )
+        )
+        oppo = always_line(
+            self.get_point_at_theta,
+            lambda: foot(self.theta.get_value()),
+            **self.oppo_config
+        )
+        self.play(ShowCreation(oppo))
+        self.wait(1)
+
+        dot.add_updater(lambda d: set_center(d, self.get_point_at_theta()))
+
+        eq = cached_tex(self.function_tex, **self.tex_config)
+        brace = always_brace(
+            lambda: oppo.points,
+            lambda: axis * np.sign(np.dot(toward(self.get_angle()), axis)),
+            label = eq
+        )
+        self.show_demo_angles(brace, eq, angle_label, final_wait = 3)
+
+
+class TangentLineScene(TrigFunctionScene):
+    # The ray through the point on the circle is extended until it meets
+    # the line tangent to the circle at tangent_angle, in the point B. The
+    # value is the length from the tangent point to B (measure "tangent",
+    # e.g. tangent and cotangent) or from the center to B (measure "secant",
+    # e.g. secant and cosecant).
+    CONFIG = {
+        "tangent_angle": 0,
+        "measure": "tangent",
+
+        "start_angle": np.radians(50),
+        "demo_angles": [
+            (np.radians(-30), 1),
+            (np.radians(145), 2),
+            (np.radians(225), 1),
+            (np.radians(25), 1),
+        ],
+        "sweep_run_times": (30, 30),
+
+        "line_config": {
+            "stroke_width": 4,
+        },
+        "radius_config": {
+            "stroke_color": WHITE,
+        },
+        "ray_config": {
+            "stroke_color": BLUE,
+        },
+        "tangent_line_config": {
+            "stroke_color": GREEN,
+        },
+    }
+
+    def get_origin(self):
+        return self.circle.get_center()
+
+    def get_tangent_point(self):
+        return self.get_origin() + self.circle.get_width() / 2 * toward(self.tangent_angle)
+
+    def get_intersection(self):
+        return self.intersection(self.theta.get_value())
+
+    def get_link_point(self):
+        return self.get_intersection()
+
+    def get_measured_points(self):
+        start = self.get_tangent_point() if self.measure == "tangent" else self.get_origin()
+        # a brace is stretched along its whole length, so rather than being
+        # clipped it stops growing once its middle (and label) is out of the frame
+        lower, upper = self.frame_bounds
+        return np.array(cap_segment(start, self.get_intersection(), 2 * np.linalg.norm((upper - lower)[:2])))
+
+    def get_brace_direction(self):
+        if self.measure == "tangent":
+            return toward(self.tangent_angle)
+        return toward(self.get_angle() - PI / 2)
+
+    def introduce(self):
+        self.theta = ValueTracker(self.start_angle)
+        self.plane = self.get_plane()
+        self.circle = self.get_circle()
+        self.intersection = self.theta_function(lambda thetas:
+            self.get_origin() + toward(thetas + self.phase) * (
+                self.circle.get_width() / 2 / np.cos(thetas + self.phase - self.tangent_angle)
+            )[..., np.newaxis]
+        )
+
+        self.play(ShowCreation(self.plane), ShowCreation(self.circle))
+        self.show_unit_brace()
+
+        # make dots
+        p_a = always_dot(self.get_point_at_theta, **self.dot_config)
+
+        # make a radius connecting O and A
+        self.radius = always_line(
+            self.get_origin,
+            self.get_point_at_theta,
+            **self.radius_config, **self.line_config
+        )
+
+        self.play(ShowCreation(self.radius), ShowCreation(p_a))
+
+        angle_label = self.get_angle_label()
+        self.play(Write(angle_label))
+        self.wait(0.5)
+
+        # make a ray crossing through the origin and point A,
+        # and a line tangent to the circle at tangent_angle
+        ray_vector = self.theta_function(lambda thetas: 12 * toward(thetas + self.phase))
+        self.ray = always_line(
+            lambda: self.get_origin() - ray_vector(self.theta.get_value()),
+            lambda: self.get_origin() + ray_vector(self.theta.get_value()),
+            **self.ray_config, **self.line_config
+        )
+
+        along = 5 * toward(self.tangent_angle + PI / 2)
+        self.perpend = always_line(
+            lambda: self.get_tangent_point() - along,
+            lambda: self.get_tangent_point() + along,
+            **self.tangent_line_config, **self.line_config
+        )
+
+        # make point B
+        p_b = always_dot(self.get_intersection, bounds = self.frame_bounds, **self.dot_config)
+
+        self.add_foreground_mobjects(self.radius, p_a)
+        self.play(ShowCreation(self.perpend))
+        self.play(ShowCreation(self.ray))
+        self.wait(0.5)
+
+        self.add_foreground_mobjects(p_b)
+        self.play(ShowCreation(p_b))
+
+        eq = cached_tex(self.function_tex, **self.tex_config)
+        brace = always_brace(self.get_measured_points, self.get_brace_direction, label = eq)
+        self.show_demo_angles(brace, eq, angle_label, final_wait = 2)
+
+
+def make_trig_scene(name, base, config, module = __name__):
+    # a scene class for one more function, e.g.
+    # make_trig_scene("Secant", TangentLineScene, {"function": lambda t: 1 / np.cos(t), ...})
+    return type(name, (base,), {"CONFIG": config, "__module__": module})
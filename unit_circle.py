@@ -0,0 +1,193 @@
+from manimlib.imports import *
+
+from cache import cached_mobject, cached_tex, get_tex_config_key
+from clipping import get_frame_bounds
+from frame_pipe import ThreadedSceneFileWriter
+from glyphs import GlyphNumberPlane, GlyphTex, glyph_tex
+from layers import StaticLayerScene
+from trajectory import ThetaFunction, get_tracker_trajectory
+
+def toward(angle):
+    # works on a single angle as well as on an array of them
+    return np.stack([np.cos(angle), np.sin(angle), np.zeros_like(angle)], axis = -1)
+
+class UnitCircleScene(StaticLayerScene):
+    CONFIG = {
+        "plane_config": {
+            "x_min": -2.5,
+            "x_max": 2.5,
+            "y_min": -2.5,
+            "y_max": 2.5,
+
+            "axis_config": {
+                "unit_size": 3,
+                "include_numbers": True,
+                "numbers_to_show": [-1, 1],
+            },
+        },
+
+        "graph_plane_config": {
+            "x_min": 0,
+            "x_max": 4.3 * PI,
+            "y_min": -2,
+            "y_max": 2,
+
+            "number_line_config": {
+                "include_tip": True,
+            },
+
+            "x_axis_config": {
+                "unit_size": 1.5 / PI,
+                "tick_frequency": PI,
+                "include_tip": True,
+            },
+
+            "y_axis_config": {
+                "unit_size": 1,
+            },
+        },
+
+        "circle_config": {
+            "radius": 3,
+        },
+
+        "dot_config": {
+            "color": YELLOW,
+        },
+
+        "tex_config": {
+            "tex_to_color_map": {
+                "\\pi": RED,
+            }
+        },
+
+        # the equation written above the graph, e.g. "\\sin\\theta"
+        "function_tex": None,
+
+        # the point on the circle sits at the angle theta + phase
+        "phase": 0,
+
+        # evaluate every theta_function for all frames of a theta animation
+        # at once, instead of once per frame inside the updaters
+        "precompute_updaters": True,
+
+        # hand frames to ffmpeg from a separate thread (see frame_pipe.py)
+        "threaded_file_writer": True,
+
+        # how far outside the frame geometry that can run off to infinity
+        # is clipped (see clipping.py), wider than any dot or stroke
+        "clip_margin": 0.5,
+    }
+
+    def setup(self):
+        super().setup()
+        if self.threaded_file_writer:
+            # in place of the SceneFileWriter made by Scene.__init__
+            self.file_writer = ThreadedSceneFileWriter(self, **self.file_writer_config)
+            if self.low_memory:
+                # hand each frame over before drawing the next one
+                self.file_writer.max_queued_frames = 0
+        self.frame_bounds = get_frame_bounds(self.camera, self.clip_margin)
+        self.theta_functions = []
+
+        self.point_at_theta = self.theta_function(lambda thetas:
+            self.circle.get_center() + self.circle.get_width() / 2 * toward(thetas + self.phase)
+        )
+        self.angle_label_position = self.theta_function(lambda thetas:
+            self.circle.get_center() + 0.75 * toward((thetas + self.phase) / 2)
+        )
+
+    def get_angle(self):
+        return self.theta.get_value() + self.phase
+
+    def get_point_at_theta(self):
+        return self.point_at_theta(self.theta.get_value())
+
+    def theta_function(self, func):
+        result = ThetaFunction(func)
+        self.theta_functions.append(result)
+        return result
+
+    def graph_points(self, xs, ys):
+        # graph_plane.coords_to_point for arrays of coordinates
+        origin = self.graph_plane.coords_to_point(0, 0)
+        x_unit = self.graph_plane.coords_to_point(1, 0) - origin
+        y_unit = self.graph_plane.coords_to_point(0, 1) - origin
+        return origin + np.multiply.outer(xs, x_unit) + np.multiply.outer(ys, y_unit)
+
+    def begin_animations(self, animations):
+        super().begin_animations(animations)
+        if not self.precompute_updaters:
+            return
+
+        # nothing else moves while theta does, so everything that depends on
+        # theta can be evaluated for the whole animation right away
+        run_time = self.get_run_time(animations)
+        for animation in animations:
+            if animation.mobject is getattr(self, "theta", None):
+                thetas = get_tracker_trajectory(animation, run_time, self.camera.frame_rate)
+                if thetas is not None:
+                    for func in self.theta_functions:
+                        func.precompute(thetas)
+
+    def finish_animations(self, animations):
+        super().finish_animations(animations)
+        for func in self.theta_functions:
+            func.clear()
+
+    # the geometry below is identical for every trig scene, so it is built
+    # once and copied out of the cache (see cache.py) on later requests
+
+    def get_plane(self):
+        return cached_mobject("plane", self.plane_config, lambda: GlyphNumberPlane(**self.plane_config))
+
+    def get_circle(self):
+        return cached_mobject("circle", self.circle_config, lambda: Circle(**self.circle_config))
+
+    def get_unit_brace(self):
+        # a brace labelled "1" under the radius pointing right
+        center = self.circle.get_center()
+        return cached_mobject("unit_brace", (self.circle_config, tuple(center)), lambda: BraceLabel(
+            Line(center, center + RIGHT * self.circle.get_width() / 2), "1",
+            label_constructor = GlyphTex,
+        ))
+
+    def get_wrap(self, everything):
+        side_length = everything.get_width() + 0.5
+        return cached_mobject("wrap", side_length, lambda: Square(side_length = side_length, fill_color = DARK_GRAY))
+
+    def get_graph_plane(self):
+        return cached_mobject("graph_plane", self.graph_plane_config, lambda: Axes(**self.graph_plane_config).to_edge(RIGHT))
+
+    def get_pi_labels(self):
+        def build():
+            numbers = VGroup()
+            for i in range(1, 5):
+                label = glyph_tex(str(i), "\\pi", **self.tex_config).move_to(self.graph_plane.coords_to_point(i * PI, -0.3)).scale(0.5)
+                numbers.add(label)
+
+            numbers.add(glyph_tex("\\theta").move_to(self.graph_plane.coords_to_point(4.2 * PI, -0.5)).scale(0.75))
+            return numbers
+
+        # only the colors of the labels' own strings, so that scenes coloring
+        # their function_tex differently share them
+        tex_config = get_tex_config_key(["1", "2", "3", "4", "\\pi"], self.tex_config)
+        return cached_mobject("pi_labels", (self.graph_plane_config, tex_config), build)
+
+    def show_graph(self):
+        everything = VGroup(self.plane, self.circle)
+        self.play(ApplyMethod(everything.scale, 1/3))
+
+        wrap = self.get_wrap(everything)
+        self.play(DrawBorderThenFill(wrap))
+        everything.add(wrap)
+
+        self.play(ApplyMethod(everything.to_edge, LEFT))
+        self.bring_to_back(self.plane, self.circle)
+
+        self.graph_plane = self.get_graph_plane()
+        numbers = self.get_pi_labels()
+
+        eq = cached_tex(self.function_tex, **self.tex_config).next_to(self.graph_plane, UP)
+        self.play(ShowCreation(self.graph_plane), Write(numbers), Write(eq))
+        self.wait(3)
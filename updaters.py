@@ -0,0 +1,169 @@
+import numpy as np
+
+from manimlib.constants import *
+from manimlib.mobject.geometry import Arc, Dot, Line
+from manimlib.mobject.svg.brace import Brace
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.utils.space_ops import rotation_matrix
+
+from cache import cached_mobject
+from clipping import clip_point, clip_segment
+
+# Alternatives to always_redraw(lambda: Line(...)) and friends, which keep a
+# single mobject alive and rewrite its points in place every frame instead
+# of building (and throwing away) a brand new one
+
+LINE_ALPHAS = np.array([0, 1 / 3, 2 / 3, 1])
+
+
+def set_line_ends(line, start, end):
+    # the same points Line.generate_points makes for a line without buff or path_arc
+    line.start, line.end = start, end
+    if line.points.shape != (4, line.dim) or line.buff != 0 or line.path_arc:
+        line.generate_points()
+        return line
+    line.points[:] = np.multiply.outer(1 - LINE_ALPHAS, start) + np.multiply.outer(LINE_ALPHAS, end)
+    return line
+
+
+def always_line(get_start, get_end, bounds = None, **kwargs):
+    # with bounds, only the part of the line inside them is kept (see clipping.py)
+    if bounds is not None:
+        get_ends = lambda: clip_segment(get_start(), get_end(), bounds)
+    else:
+        get_ends = lambda: (get_start(), get_end())
+    line = Line(*get_ends(), **kwargs)
+    line.add_updater(lambda l: set_line_ends(l, *get_ends()))
+    return line
+
+
+def get_anchors(vmobject):
+    # the points of VMobject.get_anchors (in another order), as one array
+    points = vmobject.points
+    if len(points) == 1:
+        return points
+    nppc = vmobject.n_points_per_cubic_curve
+    starts, ends = points[0::nppc], points[nppc - 1::nppc]
+    n = min(len(starts), len(ends))
+    return np.vstack([starts[:n], ends[:n]])
+
+
+def set_center(mobject, point):
+    # mobject.move_to(point), moving the points in place, instead of
+    # building the boundary point by point and copying every member's
+    # points as Mobject.shift does
+    family = mobject.get_family()
+    if not all(isinstance(member, VMobject) for member in family):
+        return mobject.move_to(point)
+    members = [member for member in family if len(member.points) > 0]
+    if not members:
+        return mobject
+    anchors = np.vstack([get_anchors(member) for member in members])
+    center = (anchors.min(0) + anchors.max(0)) / 2 if len(anchors) > 0 else np.zeros(mobject.dim)
+    vector = np.asarray(point) - center
+    for member in members:
+        member.points += vector
+    return mobject
+
+
+def always_dot(get_point, bounds = None, **kwargs):
+    if bounds is not None:
+        get_center = lambda: clip_point(get_point(), bounds)
+    else:
+        get_center = get_point
+    dot = Dot(get_center(), **kwargs)
+    dot.add_updater(lambda d: set_center(d, get_center()))
+    return dot
+
+
+def set_arc(arc, arc_center, angle):
+    # the same points Arc.generate_points makes, written in place
+    arc.arc_center, arc.angle = arc_center, angle
+    n = arc.num_components
+    if arc.points.shape != (4 * (n - 1), arc.dim):
+        arc.generate_points()
+        return arc
+
+    angles = np.linspace(arc.start_angle, arc.start_angle + angle, n)
+    anchors = np.stack([np.cos(angles), np.sin(angles), np.zeros(n)], axis = -1)
+    tangents = np.stack([-anchors[:, 1], anchors[:, 0], np.zeros(n)], axis = -1)
+    d_theta = angle / (n - 1.0)
+    arc.points[0::4] = anchors[:-1]
+    arc.points[1::4] = anchors[:-1] + (d_theta / 3) * tangents[:-1]
+    arc.points[2::4] = anchors[1:] - (d_theta / 3) * tangents[1:]
+    arc.points[3::4] = anchors[1:]
+    arc.points *= arc.radius
+    arc.points += arc_center
+    return arc
+
+
+def always_arc(get_arc_center, get_angle, **kwargs):
+    arc = Arc(arc_center = get_arc_center(), angle = get_angle(), **kwargs)
+    arc.add_updater(lambda a: set_arc(a, get_arc_center(), get_angle()))
+    return arc
+
+
+def get_brace_template(num_quads, **kwargs):
+    # An upright brace under a horizontal segment, with num_quads quads.
+    # Typesetting it is the expensive part of a Brace, and there are
+    # only max_num_quads + 1 different ones.
+    width_multiplier = kwargs.get("width_multiplier", Brace.CONFIG["width_multiplier"])
+    return cached_mobject("brace", (num_quads, kwargs), lambda: Brace(
+        Line(ORIGIN, RIGHT * (num_quads + 0.5) / width_multiplier), DOWN, **kwargs
+    ))
+
+
+def set_brace(brace, points, direction, templates, **kwargs):
+    # The same steps as Brace.__init__, applied to a cached template, so
+    # the brace is only typeset again when its number of quads changes
+    angle = -np.arctan2(*direction[:2]) + np.pi
+    rotated = np.dot(points, np.transpose(rotation_matrix(-angle, OUT)))
+    left = rotated[:, :2].min(0)
+    target_width = rotated[:, 0].max() - left[0]
+
+    num_quads = int(np.clip(
+        int(brace.width_multiplier * target_width),
+        brace.min_num_quads, brace.max_num_quads
+    ))
+    if num_quads not in templates:
+        templates[num_quads] = get_brace_template(num_quads, **kwargs)
+    template = templates[num_quads]
+
+    template_members = template.family_members_with_points()
+    template_points = np.vstack([m.points for m in template_members])
+    x_min, x_max = template_points[:, 0].min(), template_points[:, 0].max()
+    top = template_points[:, 1].max()
+    center_x = (x_min + x_max) / 2
+
+    # stretch_to_fit_width, then shift the upper left corner to just below
+    # the left end of the (rotated) mobject, then rotate back
+    scale = np.array([target_width / (x_max - x_min), 1, 1])
+    shift = np.array([
+        left[0] - (center_x - target_width / 2) + center_x * (1 - scale[0]),
+        left[1] - top - brace.buff,
+        0,
+    ])
+    rotation = np.transpose(rotation_matrix(angle, OUT))
+
+    members = brace.family_members_with_points()
+    if [m.points.shape for m in members] != [m.points.shape for m in template_members]:
+        brace.become(template)
+        brace.tip_point_index = template.tip_point_index
+        members = brace.family_members_with_points()
+    for member, template_member in zip(members, template_members):
+        member.points[:] = np.dot(template_member.points * scale + shift, rotation)
+    return brace
+
+
+def always_brace(get_points, get_direction, label = None, **kwargs):
+    # get_points gives the points the brace should span, e.g. a line's end points
+    brace = Brace(VMobject().set_points(get_points()), get_direction(), **kwargs)
+    templates = {}
+
+    brace.add_updater(lambda b: set_brace(b, get_points(), get_direction(), templates, **kwargs))
+    if label is not None:
+        # the label follows with an updater of its own, so the scene knows
+        # it moves (see layers.py)
+        brace.put_at_tip(label)
+        label.add_updater(lambda l: brace.put_at_tip(l))
+    return brace
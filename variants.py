@@ -0,0 +1,48 @@
+import numpy as np
+
+from manimlib.constants import BLUE, MAROON, PI, PINK, PURPLE, TEAL
+
+from trig_scenes import ProjectionScene, TangentLineScene, make_trig_scene
+
+# More functions, as scene configs. Sine, Cosine and Tangent have their own
+# modules; everything built for one scene (planes, circles, labels, braces,
+# typeset tex) is shared with the others through the caches in cache.py.
+VARIANTS = [
+    ("Cotangent", TangentLineScene, {
+        "function": lambda t: 1 / np.tan(t),
+        "asymptotes": [k * PI for k in range(5)],
+        "tangent_angle": PI / 2,
+        "function_tex": "\\cot\\theta",
+        "graph_config": {"color": TEAL},
+        "tex_config": {"tex_to_color_map": {"\\cot": TEAL}},
+    }),
+    ("Secant", TangentLineScene, {
+        "function": lambda t: 1 / np.cos(t),
+        "asymptotes": [PI / 2 + k * PI for k in range(5)],
+        "measure": "secant",
+        "function_tex": "\\sec\\theta",
+        "graph_config": {"color": MAROON},
+        "tex_config": {"tex_to_color_map": {"\\sec": MAROON}},
+    }),
+    ("Cosecant", TangentLineScene, {
+        "function": lambda t: 1 / np.sin(t),
+        "asymptotes": [k * PI for k in range(5)],
+        "tangent_angle": PI / 2,
+        "measure": "secant",
+        "function_tex": "\\csc\\theta",
+        "graph_config": {"color": PINK},
+        "tex_config": {"tex_to_color_map": {"\\csc": PINK}},
+    }),
+    ("ShiftedSine", ProjectionScene, {
+        "function": np.sin,
+        "phase": PI / 4,
+        "function_tex": "\\sin(\\theta + 45^\\circ)",
+        "angle_tex": "\\theta + 45^\\circ",
+        "graph_config": {"color": BLUE},
+        "oppo_config": {"color": PURPLE},
+        "tex_config": {"tex_to_color_map": {"\\sin": PURPLE}},
+    }),
+]
+
+for name, base, config in VARIANTS:
+    globals()[name] = make_trig_scene(name, base, config, module = __name__)
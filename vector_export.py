@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+import argparse
+import gzip
+import os
+import time
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+
+import manimlib.constants as consts
+from manimlib.mobject.types.vectorized_mobject import VMobject
+from manimlib.scene.scene import Scene
+from manimlib.utils.color import color_to_rgb, rgb_to_hex
+from manimlib.utils.iterables import list_update
+
+from render_all import QUALITY_PRESETS, REPO_DIR, init_media_dirs, load_scene_class
+
+# svg units per unit of the frame
+SVG_SCALE = 100
+
+# points per cubic curve of a VMobject
+CURVE_POINTS = 4
+
+# the attributes of a path that can change from frame to frame
+PATH_ATTRIBUTES = [
+    "display",
+    "d",
+    "stroke-dashoffset",
+    "fill",
+    "fill-opacity",
+    "stroke",
+    "stroke-opacity",
+    "stroke-width",
+]
+
+
+class VectorExportMixin(object):
+    # Exports the scene as an animated SVG that browsers play by themselves
+    # (SMIL), instead of a movie. Nothing is drawn: every vector_frame_rate-th
+    # of a second, the path and style of every VMobject on screen are
+    # recorded, the way the camera would draw them. Each VMobject becomes one
+    # <path>, and each attribute of it is written out only at the times it
+    # changes, so everything static costs the same as a single frame.
+    #
+    # A path that only grows and shrinks along itself, like a graph drawn
+    # up to theta, is written once, at its longest, and revealed with a
+    # dash (stroke-dashoffset), rather than written again at every length.
+    #
+    # Paths are stacked in the order the mobjects are drawn in. A mobject
+    # that shows up later is put right above the one drawn below it when it
+    # first appears. Gradients (sheen) are drawn in their first color.
+    CONFIG = {
+        "vector_frame_rate": 30,
+        # of the svg coordinates, in SVG_SCALE units per unit of the frame
+        "vector_decimals": 1,
+        "vector_file_path": None,
+        # static layers (see layers.py) are raster only
+        "cache_static_layers": False,
+    }
+
+    def setup(self):
+        super().setup()
+        # id(mobject) -> (mobject, paths drawn by it), in drawing order
+        self.vector_tracks = {}
+        self.vector_order = []
+        self.vector_times = []
+        self.next_vector_time = 0
+
+    def tear_down(self):
+        super().tear_down()
+        if self.vector_file_path is not None:
+            self.write_svg(self.vector_file_path)
+
+    def progress_through_animations(self, animations):
+        # nothing gets drawn, so skip preparations like rasterizing layers
+        return Scene.progress_through_animations(self, animations)
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def get_frame(self):
+        return None
+
+    def add_frames(self, *frames):
+        if self.time >= self.next_vector_time - 1e-9:
+            self.record_vector_frame()
+            while self.next_vector_time <= self.time + 1e-9:
+                self.next_vector_time += 1 / self.vector_frame_rate
+        super().add_frames(*frames)
+
+    # recording
+
+    def record_vector_frame(self):
+        index = len(self.vector_times)
+        self.vector_times.append(self.time)
+        mobjects = self.camera.extract_mobject_family_members(
+            list_update(self.mobjects, self.foreground_mobjects),
+            only_those_with_points = True,
+        )
+        below = None
+        for mobject in mobjects:
+            if not isinstance(mobject, VMobject):
+                continue
+            track = self.get_vector_track(mobject, below)
+            for path, state in zip(track["paths"], self.get_path_states(mobject, track)):
+                path["frames"].append((index, state))
+            below = mobject
+
+    def get_vector_track(self, mobject, below):
+        key = id(mobject)
+        if key not in self.vector_tracks:
+            # keeping the mobject keeps its id from going to another one
+            self.vector_tracks[key] = {
+                "mobject": mobject,
+                "paths": [{"frames": []}, {"frames": []}],
+                "points": None,
+                # every shape the mobject took, each as a change of the one
+                # before (see get_shape_delta)
+                "shapes": [],
+            }
+            position = self.vector_order.index(id(below)) + 1 if below is not None else 0
+            self.vector_order.insert(position, key)
+        return self.vector_tracks[key]
+
+    def get_path_states(self, vmobject, track):
+        # the background stroke and the fill and stroke, as cairo draws them
+        if track["points"] is None or not np.array_equal(track["points"], vmobject.points):
+            track["shapes"].append(get_shape_delta(track["points"], vmobject.points))
+            track["points"] = np.array(vmobject.points)
+        shape = len(track["shapes"]) - 1
+        fill = vmobject.get_fill_rgbas()[0]
+        stroke = vmobject.get_stroke_rgbas()[0]
+        background = vmobject.get_stroke_rgbas(background = True)[0]
+        return [
+            (shape, (0, 0, 0, 0), background, vmobject.get_stroke_width(background = True)),
+            (shape, fill, stroke, vmobject.get_stroke_width()),
+        ]
+
+    def get_svg_points(self, points):
+        camera = self.camera
+        corner = camera.get_frame_center() + np.array([-camera.get_frame_width() / 2, camera.get_frame_height() / 2, 0])
+        return (points[:, :2] - corner[:2]) * [SVG_SCALE, -SVG_SCALE]
+
+    def get_path_data(self, vmobject, points):
+        points = np.round(self.get_svg_points(points), self.vector_decimals)
+        commands = []
+        for subpath in vmobject.gen_subpaths_from_points_2d(points):
+            commands.append("M" + format_point(subpath[0]))
+            commands.append("C" + " ".join(
+                format_point(point)
+                for p0, p1, p2, p3 in vmobject.gen_cubic_bezier_tuples_from_points(subpath)
+                for point in (p1, p2, p3)
+            ))
+            if vmobject.consider_points_equals_2d(subpath[0], subpath[-1]):
+                commands.append("Z")
+        return "".join(commands)
+
+    # writing
+
+    def get_shape_attributes(self, track, revealable):
+        # the d of every shape of the track, or if it can be revealed, the
+        # d of its longest shape once and how much of it every shape shows
+        shapes = list(iter_shapes(track["shapes"]))
+        mobject = track["mobject"]
+        if revealable and len(shapes) > 1 and all(len(points) % CURVE_POINTS == 0 for points in shapes):
+            # the same number of curves can end in part of the last one
+            longest = max(shapes, key = lambda points: (
+                len(points), get_curve_lengths(self.get_svg_points(points)).sum(),
+            ))
+            lengths = np.concatenate([[0], np.cumsum(get_curve_lengths(self.get_svg_points(longest)))])
+            revealed = [self.get_revealed_length(points, longest, lengths) for points in shapes]
+            if None not in revealed and lengths[-1] > 0:
+                total = lengths[-1]
+                static = {
+                    "d": self.get_path_data(mobject, longest),
+                    "pathLength": format_number(total, 2),
+                    "stroke-dasharray": "{0} {0}".format(format_number(total, 2)),
+                }
+                return static, [
+                    {"stroke-dashoffset": format_number(total - length, 2), "shown": length > 0}
+                    for length in revealed
+                ]
+        return {}, [
+            {"d": d, "shown": d != ""}
+            for d in (self.get_path_data(mobject, points) for points in shapes)
+        ]
+
+    def get_revealed_length(self, points, longest, lengths):
+        # how far along longest points goes, if it only covers a start of
+        # it: whole curves of it, then possibly part of the next one
+        n = len(points)
+        if n % CURVE_POINTS != 0 or n > len(longest):
+            return None
+        if np.array_equal(points, longest[:n]):
+            return lengths[n // CURVE_POINTS]
+        start = n - CURVE_POINTS
+        if not np.array_equal(points[:start], longest[:start]):
+            return None
+        if not is_start_of_curve(points[start:], longest[start:start + CURVE_POINTS]):
+            return None
+        partial = get_curve_lengths(self.get_svg_points(points[start:]))[0]
+        index = start // CURVE_POINTS
+        return lengths[index] + min(partial, lengths[index + 1] - lengths[index])
+
+    def get_path_attributes(self, state, shapes):
+        shape, fill, stroke, stroke_width = state
+        # the svg is SVG_SCALE units per unit of the frame, see Camera.apply_stroke
+        width = stroke_width * self.camera.cairo_line_width_multiple * SVG_SCALE * (
+            self.camera.get_frame_width() / consts.FRAME_WIDTH
+        )
+        attributes = dict(shapes[shape])
+        shown = attributes.pop("shown")
+        visible = (fill[3] > 0 or (stroke[3] > 0 and width > 0)) and shown
+        return dict(attributes, **{
+            "display": "inline" if visible else "none",
+            "fill": rgb_to_hex(fill[:3]),
+            "fill-opacity": format_number(fill[3], 3),
+            "stroke": rgb_to_hex(stroke[:3]),
+            "stroke-opacity": format_number(stroke[3], 3),
+            "stroke-width": format_number(width, 2) if stroke[3] > 0 else "0",
+        })
+
+    def get_path_element(self, frames, track, duration):
+        # the value of every attribute at each recorded frame, with
+        # "display: none" for the frames the path wasn't drawn in.
+        # A dash would hide the fill too, so only unfilled paths are revealed
+        # by one.
+        static_shape, shapes = self.get_shape_attributes(
+            track, all(state[1][3] == 0 for _, state in frames),
+        )
+        n_frames = len(self.vector_times)
+        values = dict((name, [None] * n_frames) for name in PATH_ATTRIBUTES)
+        for index, state in frames:
+            for name, value in self.get_path_attributes(state, shapes).items():
+                values[name][index] = value
+        shown = values["display"]
+        if all(value != "inline" for value in shown):
+            return None
+        for index in range(n_frames):
+            if shown[index] is None:
+                shown[index] = "none"
+
+        static = ["{}={}".format(name, quoteattr(value)) for name, value in static_shape.items()]
+        animations = []
+        for name in PATH_ATTRIBUTES:
+            # frames the path isn't drawn in keep the value before them
+            changes = []
+            for index, value in enumerate(values[name]):
+                if value is None:
+                    continue
+                if not changes:
+                    changes.append((0, value))
+                elif value != changes[-1][1]:
+                    changes.append((index, value))
+            if not changes:
+                continue
+            if len(changes) == 1:
+                static.append("{}={}".format(name, quoteattr(changes[0][1])))
+                continue
+            key_times = ";".join(
+                format_number(self.vector_times[index] / duration if index > 0 else 0, 5)
+                for index, _ in changes
+            )
+            animations.append(
+                "<animate attributeName={} dur=\"{}s\" calcMode=\"discrete\" fill=\"freeze\" "
+                "keyTimes=\"{}\" values={}/>".format(
+                    quoteattr(name), format_number(duration, 3), key_times,
+                    quoteattr(";".join(value for _, value in changes)),
+                )
+            )
+        if not animations:
+            return "<path {}/>".format(" ".join(static))
+        return "<path {}>{}</path>".format(" ".join(static), "".join(animations))
+
+    def get_svg(self):
+        camera = self.camera
+        duration = max(self.time, 1 / self.vector_frame_rate)
+        width = camera.get_frame_width() * SVG_SCALE
+        height = camera.get_frame_height() * SVG_SCALE
+        lines = [
+            "<svg xmlns=\"http://www.w3.org/2000/svg\" viewBox=\"0 0 {} {}\" width=\"{}\" height=\"{}\">".format(
+                format_number(width, 3), format_number(height, 3),
+                camera.get_pixel_width(), camera.get_pixel_height(),
+            ),
+            "<rect width=\"100%\" height=\"100%\" fill=\"{}\"/>".format(rgb_to_hex(color_to_rgb(camera.background_color))),
+        ]
+        for key in self.vector_order:
+            track = self.vector_tracks[key]
+            for path in track["paths"]:
+                element = self.get_path_element(path["frames"], track, duration)
+                if element is not None:
+                    lines.append(element)
+        lines.append("</svg>")
+        return "\n".join(lines)
+
+    def write_svg(self, file_path):
+        os.makedirs(os.path.dirname(file_path), exist_ok = True)
+        data = self.get_svg().encode()
+        opener = gzip.open if file_path.endswith(".svgz") else open
+        with opener(file_path, "wb") as fp:
+            fp.write(data)
+
+
+def get_shape_delta(old_points, points):
+    # points, as the number of rows they start with in common with
+    # old_points and the rest of them, so that a path that grows a little
+    # every frame is stored only once
+    if old_points is None:
+        return 0, np.array(points)
+    n = min(len(old_points), len(points))
+    differ = np.flatnonzero(np.any(old_points[:n] != points[:n], axis = 1))
+    common = differ[0] if len(differ) > 0 else n
+    return common, np.array(points[common:])
+
+
+def iter_shapes(deltas):
+    points = np.zeros((0, 3))
+    for common, rest in deltas:
+        points = np.vstack([points[:common], rest])
+        yield points
+
+
+def is_start_of_curve(part, curve):
+    # whether the cubic curve part is curve from its start up to some
+    # point on it, as partial_bezier_points cuts it
+    direction = curve[1] - curve[0]
+    norm = np.dot(direction, direction)
+    if norm == 0:
+        return False
+    a = np.dot(part[1] - curve[0], direction) / norm
+    if not 0 <= a <= 1:
+        return False
+    b = 1 - a
+    expected = [
+        curve[0],
+        b * curve[0] + a * curve[1],
+        b * b * curve[0] + 2 * a * b * curve[1] + a * a * curve[2],
+        b ** 3 * curve[0] + 3 * a * b * b * curve[1] + 3 * a * a * b * curve[2] + a ** 3 * curve[3],
+    ]
+    return np.allclose(part, expected, rtol = 1e-6, atol = 1e-6)
+
+
+def get_curve_lengths(points, samples = 16):
+    # the length of every cubic curve of the (2d) points, from straight
+    # lines between samples along it
+    curves = points.reshape((-1, CURVE_POINTS, points.shape[1]))
+    t = np.linspace(0, 1, samples + 1)[:, np.newaxis]
+    weights = np.hstack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3])
+    sampled = np.einsum("sk,ckd->csd", weights, curves)
+    return np.linalg.norm(np.diff(sampled, axis = 1), axis = 2).sum(axis = 1)
+
+
+def format_number(x, decimals):
+    # shortest form, e.g. 2 instead of 2.000
+    text = "{:.{}f}".format(x, decimals).rstrip("0").rstrip(".")
+    return "0" if text in ("", "-0") else text
+
+
+def format_point(point):
+    return "{} {}".format(format_number(point[0], 3), format_number(point[1], 3))
+
+
+def make_vector_scene_class(scene_class):
+    # keep the scene's name so output directories match a regular render
+    return type(scene_class.__name__, (VectorExportMixin, scene_class), {})
+
+
+def get_vector_file_path(module_name, scene_name, compress = False):
+    # the svg doesn't depend on the resolution it's shown at
+    return os.path.join(consts.VIDEO_DIR, module_name, "vector", scene_name + (".svgz" if compress else ".svg"))
+
+
+def export_vector(module_name, scene_name, quality, media_dir, frame_rate = 30, compress = False):
+    init_media_dirs(media_dir)
+    module, scene_class = load_scene_class(module_name, scene_name)
+    file_path = get_vector_file_path(module_name, scene_name, compress)
+    make_vector_scene_class(scene_class)(
+        camera_config = dict(QUALITY_PRESETS[quality]),
+        file_writer_config = {
+            "write_to_movie": False,
+            "save_last_frame": False,
+            "input_file_path": module.__file__,
+        },
+        vector_frame_rate = frame_rate,
+        vector_file_path = file_path,
+    )
+    return file_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Export a scene as an animated SVG instead of a movie")
+    parser.add_argument("module", help = "module holding the scene, e.g. tangent")
+    parser.add_argument("scene", help = "name of the scene, e.g. Tangent")
+    parser.add_argument(
+        "-q", "--quality",
+        default = "production",
+        choices = list(QUALITY_PRESETS),
+        help = "sets the frame rate the scene runs at, and the default size of the svg",
+    )
+    parser.add_argument(
+        "-r", "--frame_rate",
+        type = float,
+        default = 30,
+        help = "keyframes per second in the svg",
+    )
+    parser.add_argument(
+        "-z", "--compress",
+        action = "store_true",
+        help = "write a gzipped .svgz",
+    )
+    parser.add_argument(
+        "--media_dir",
+        default = os.path.join(REPO_DIR, "media"),
+    )
+    args = parser.parse_args()
+
+    start = time.time()
+    file_path = export_vector(
+        args.module, args.scene, args.quality, args.media_dir,
+        frame_rate = args.frame_rate,
+        compress = args.compress,
+    )
+    print("Wrote {} ({:.1f} MB) in {:.1f}s".format(
+        file_path, os.path.getsize(file_path) / 1024 / 1024, time.time() - start,
+    ))
+
+
+if __name__ == "__main__":
+    main()